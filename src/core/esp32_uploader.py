@@ -4,9 +4,12 @@ import os
 import platform
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Callable, Optional
 
+import serial
+
 # Windows: Hide console window for subprocess calls
 # Prevents CMD windows from flashing when calling esptool
 if platform.system() == "Windows":
@@ -94,8 +97,6 @@ class ESP32Uploader:
         Production workflow: Port stays open, monitor data flow to detect MCU power cycles.
         """
         try:
-            import time
-
             if wait_for_power_on:
                 # MODE 1: Waiting for NEW MCU to power on
                 # Monitor for NEW incoming serial data (MCU bootloader sends data on boot)
@@ -188,9 +189,6 @@ class ESP32Uploader:
         3. Upload starts automatically
         4. Replace board and repeat
         """
-        import time
-        import serial
-
         if progress_callback:
             progress_callback("=" * 60)
             progress_callback("AUTOMATIC MODE ENABLED")
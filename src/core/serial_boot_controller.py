@@ -5,10 +5,45 @@ from typing import Callable, Optional
 
 import serial
 
+_SIGNAL_MAPPING_INFO = """Expected TTL-RS232 Module Connections:
+        
+DTR → GPIO0 (Boot pin)
+RTS → EN/RST (Reset pin)
+TX ↔ RX (Data) ⚠️ Critical for communication
+RX ↔ TX (Data) ⚠️ Critical for communication  
+GND ↔ GND ⚠️ Must be connected
+VCC → 3.3V (Power - if needed)
+
+Signal Logic:
+- DTR/RTS are active LOW
+- DTR=True → GPIO0=LOW (boot mode)
+- RTS=True → EN=LOW (reset)
+
+Boot Sequence:
+1. DTR=True (GPIO0=LOW)
+2. RTS=True (EN=LOW, reset)  
+3. RTS=False (EN=HIGH, release reset)
+4. DTR=False (GPIO0=HIGH, optional)
+
+Troubleshooting:
+- If "No response" error: Check TX/RX wiring
+- If boot fails: Check DTR/RTS connections
+- Test with multimeter on ESP32 GPIO0/EN pins"""
+
 
 class SerialBootController:
     """Controls ESP32 boot mode through DTR/RTS signals."""
 
+    # DTR/RTS timing (seconds). The holds are longer than esptool's 50-100 ms
+    # for TTL-RS232 compatibility; an adapter known to switch quickly can use
+    # shorter values by overriding these on the instance or a subclass.
+    BOOT_GPIO0_HOLD = 0.25  # GPIO0 LOW before reset
+    BOOT_RESET_HOLD = 0.25  # EN LOW (reset) duration
+    BOOT_STABILIZE = 0.25  # Settle time after releasing reset
+    BOOT_RELEASE = 0.05  # Extra GPIO0 hold before release
+    NORMAL_BOOT_RESET_HOLD = 0.1
+    SIGNAL_TEST_HOLD = 0.25  # Long enough to see on an LED or meter
+
     def __init__(self, port: str, baud_rate: int = 115200):
         """Initialize serial boot controller.
 
@@ -69,18 +104,18 @@ class SerialBootController:
 
             # Step 1: Pull GPIO0 LOW (DTR = True, active low)
             self.serial_connection.dtr = True  # GPIO0 = LOW
-            time.sleep(0.25)  # Increased for TTL-RS232 compatibility
+            time.sleep(self.BOOT_GPIO0_HOLD)
 
             # Step 2: Reset the chip (RTS = True, active low)
             self.serial_connection.rts = True  # EN = LOW (reset)
-            time.sleep(0.25)  # Increased reset hold time
+            time.sleep(self.BOOT_RESET_HOLD)
 
             # Step 3: Release reset while GPIO0 is still LOW
             self.serial_connection.rts = False  # EN = HIGH (release reset)
-            time.sleep(0.25)  # Increased stabilization time
+            time.sleep(self.BOOT_STABILIZE)
 
             # Step 4: Keep GPIO0 LOW for a bit more, then release
-            time.sleep(0.05)  # Additional hold time
+            time.sleep(self.BOOT_RELEASE)
             self.serial_connection.dtr = False  # GPIO0 can be released
 
             if progress_callback:
@@ -108,17 +143,14 @@ class SerialBootController:
             # ESP32 bootloader responds to sync commands
             sync_command = b"\xc0\x00\x08\x24\x00\x00\x00\x00\x00\x07\x07\x12\x20\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\x55\xc0"
 
-            # Clear any existing data
+            # Discard stale RX left over from the reset sequence. Nothing is
+            # queued on TX yet, and a 46-byte write needs no explicit flush.
             self.serial_connection.reset_input_buffer()
-            self.serial_connection.reset_output_buffer()
 
             # Send sync command
             self.serial_connection.write(sync_command)
-            self.serial_connection.flush()
 
             # Wait for response
-            import time
-
             time.sleep(0.1)
 
             # Check if we got any response
@@ -162,9 +194,9 @@ class SerialBootController:
 
             # Step 2: Reset pulse
             self.serial_connection.rts = True  # EN = LOW (reset)
-            time.sleep(0.1)
+            time.sleep(self.NORMAL_BOOT_RESET_HOLD)
             self.serial_connection.rts = False  # EN = HIGH (release reset)
-            time.sleep(0.1)
+            time.sleep(self.NORMAL_BOOT_RESET_HOLD)
 
             if progress_callback:
                 progress_callback("ESP32 normal boot completed")
@@ -193,15 +225,15 @@ class SerialBootController:
 
             # Test DTR control
             self.serial_connection.dtr = True
-            time.sleep(0.25)  # Increased for better visibility
+            time.sleep(self.SIGNAL_TEST_HOLD)
             self.serial_connection.dtr = False
-            time.sleep(0.25)
+            time.sleep(self.SIGNAL_TEST_HOLD)
 
             # Test RTS control
             self.serial_connection.rts = True
-            time.sleep(0.25)  # Increased for better visibility
+            time.sleep(self.SIGNAL_TEST_HOLD)
             self.serial_connection.rts = False
-            time.sleep(0.25)
+            time.sleep(self.SIGNAL_TEST_HOLD)
 
             if progress_callback:
                 progress_callback("DTR/RTS control test completed")
@@ -215,36 +247,14 @@ class SerialBootController:
         finally:
             self.close_connection()
 
-    def get_signal_mapping_info(self) -> str:
+    @staticmethod
+    def get_signal_mapping_info() -> str:
         """Get information about signal mapping.
 
         Returns:
             String describing the expected signal connections
         """
-        return """Expected TTL-RS232 Module Connections:
-        
-DTR → GPIO0 (Boot pin)
-RTS → EN/RST (Reset pin)
-TX ↔ RX (Data) ⚠️ Critical for communication
-RX ↔ TX (Data) ⚠️ Critical for communication  
-GND ↔ GND ⚠️ Must be connected
-VCC → 3.3V (Power - if needed)
-
-Signal Logic:
-- DTR/RTS are active LOW
-- DTR=True → GPIO0=LOW (boot mode)
-- RTS=True → EN=LOW (reset)
-
-Boot Sequence:
-1. DTR=True (GPIO0=LOW)
-2. RTS=True (EN=LOW, reset)  
-3. RTS=False (EN=HIGH, release reset)
-4. DTR=False (GPIO0=HIGH, optional)
-
-Troubleshooting:
-- If "No response" error: Check TX/RX wiring
-- If boot fails: Check DTR/RTS connections
-- Test with multimeter on ESP32 GPIO0/EN pins"""
+        return _SIGNAL_MAPPING_INFO
 
     def __enter__(self):
         """Context manager entry."""
@@ -1,68 +1,238 @@
 """Settings management module."""
 
+import hashlib
 import json
+import mmap
+import os
+import time
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+# Prefer orjson (C extension) for settings I/O, fall back to stdlib json
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+# Use project directory config file instead of home directory; resolved once at import
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_CONFIG_FILE = _PROJECT_ROOT / ".wf_firmware_uploader_config.json"
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize settings to indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS matches stdlib json, which coerces non-str keys
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _load_file(path: Path) -> Any:
+    """Parse a JSON file, mapping it into memory when orjson can read the buffer.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    catch the stdlib exception for either parser.
+    """
+    if orjson is None:
+        return json.loads(path.read_bytes())
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # mmap cannot map an empty file; let the parser report the error
+            return orjson.loads(b"")
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+
+def _write_synced(path: Path, data: bytes):
+    """Write data to path and fsync it before returning."""
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# Default settings; cloned for each SettingsManager, never mutated directly
+_DEFAULTS: Dict[str, Any] = {
+    "version": "1.0",
+    "window": {"x": 100, "y": 100, "width": 1000, "height": 750},
+    "ui": {
+        "auto_platform_scale": True,  # Automatically scale based on platform
+        "scale_factor": None,  # Custom scale factor (overrides auto scaling)
+    },
+    "stm32": {
+        "last_firmware_path": "",
+        "last_port": "SWD",
+        "flash_address": "0x08000000",
+        "full_erase": False,
+        "auto_mode": False,  # Automatic mode for production workflow
+        "connection_mode": "HOTPLUG",  # HOTPLUG, UR, Normal
+        "hardware_reset": False,
+        "connection_speed": 4000,  # kHz
+        "retry_attempts": 3,
+    },
+    "esp32": {
+        "last_firmware_files": [],  # List of [address, filepath] pairs
+        "last_port": "",
+        "full_erase": False,
+        "auto_mode": False,  # Automatic mode for production workflow
+        "baud_rate": 921600,
+        "before_reset": True,  # --before default-reset
+        "after_reset": True,  # --after hard-reset
+        "no_sync": False,  # --before no-reset-no-sync
+        "connect_attempts": 1,
+    },
+    "counters": {
+        "stm32": {"total": 0, "pass": 0, "fail": 0},
+        "esp32": {"total": 0, "pass": 0, "fail": 0},
+    },
+}
+
+
+# Sections holding only scalar/list values, mergeable with one dict.update()
+_FLAT_SECTIONS = frozenset(
+    key
+    for key, value in _DEFAULTS.items()
+    if type(value) is dict and not any(type(item) is dict for item in value.values())
+)
+
+# Sentinel for single-probe dict lookups
+_MISSING = object()
+
+
+def _clone(value: Any) -> Any:
+    """Copy JSON-shaped data (dicts/lists of scalars) without deepcopy's dispatch."""
+    if type(value) is dict:
+        return {key: _clone(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_clone(item) for item in value]
+    return value
+
+
+# Inclusive (min, max) limits enforced by the generated setters
+_BOUNDS: Dict[str, Tuple[int, int]] = {
+    "stm32.retry_attempts": (1, 10),
+    "stm32.connection_speed": (5, 24000),  # kHz, ST-LINK supported range
+    "esp32.connect_attempts": (1, 10),
+    "esp32.baud_rate": (9600, 3_000_000),
+}
+
+# Simple scalar settings: accessor suffix -> (section, key, description).
+# get_<name>/set_<name> methods are generated on SettingsManager from this table.
+_SCHEMA: Dict[str, Tuple[str, str, str]] = {
+    # STM32 settings
+    "stm32_last_firmware": ("stm32", "last_firmware_path", "last STM32 firmware file path"),
+    "stm32_last_port": ("stm32", "last_port", "last STM32 port"),
+    "stm32_flash_address": ("stm32", "flash_address", "STM32 flash address"),
+    "stm32_full_erase": ("stm32", "full_erase", "STM32 full erase setting"),
+    "stm32_connection_mode": ("stm32", "connection_mode", "STM32 connection mode setting"),
+    "stm32_hardware_reset": ("stm32", "hardware_reset", "STM32 hardware reset setting"),
+    "stm32_connection_speed": ("stm32", "connection_speed", "STM32 connection speed setting"),
+    "stm32_retry_attempts": ("stm32", "retry_attempts", "STM32 retry attempts setting"),
+    "stm32_auto_mode": ("stm32", "auto_mode", "STM32 automatic mode setting"),
+    # ESP32 settings
+    "esp32_last_port": ("esp32", "last_port", "last ESP32 port"),
+    "esp32_full_erase": ("esp32", "full_erase", "ESP32 full erase setting"),
+    "esp32_baud_rate": ("esp32", "baud_rate", "ESP32 baud rate setting"),
+    "esp32_before_reset": ("esp32", "before_reset", "ESP32 before reset setting"),
+    "esp32_after_reset": ("esp32", "after_reset", "ESP32 after reset setting"),
+    "esp32_no_sync": ("esp32", "no_sync", "ESP32 no-sync setting"),
+    "esp32_connect_attempts": ("esp32", "connect_attempts", "ESP32 connect attempts setting"),
+    "esp32_auto_mode": ("esp32", "auto_mode", "ESP32 automatic mode setting"),
+}
 
 
 class SettingsManager:
-    """Manages application settings and configuration."""
+    """Manages application settings and configuration.
+
+    Scalar get_*/set_* accessors are generated from _SCHEMA after the class body.
+    """
+
+    if TYPE_CHECKING:
+        # Accessors generated from _SCHEMA below; keep in sync with that table
+        get_stm32_last_firmware: Callable[[], str]
+        set_stm32_last_firmware: Callable[[str], None]
+        get_stm32_last_port: Callable[[], str]
+        set_stm32_last_port: Callable[[str], None]
+        get_stm32_flash_address: Callable[[], str]
+        set_stm32_flash_address: Callable[[str], None]
+        get_stm32_full_erase: Callable[[], bool]
+        set_stm32_full_erase: Callable[[bool], None]
+        get_stm32_connection_mode: Callable[[], str]
+        set_stm32_connection_mode: Callable[[str], None]
+        get_stm32_hardware_reset: Callable[[], bool]
+        set_stm32_hardware_reset: Callable[[bool], None]
+        get_stm32_connection_speed: Callable[[], int]
+        set_stm32_connection_speed: Callable[[int], None]
+        get_stm32_retry_attempts: Callable[[], int]
+        set_stm32_retry_attempts: Callable[[int], None]
+        get_stm32_auto_mode: Callable[[], bool]
+        set_stm32_auto_mode: Callable[[bool], None]
+
+        get_esp32_last_port: Callable[[], str]
+        set_esp32_last_port: Callable[[str], None]
+        get_esp32_full_erase: Callable[[], bool]
+        set_esp32_full_erase: Callable[[bool], None]
+        get_esp32_baud_rate: Callable[[], int]
+        set_esp32_baud_rate: Callable[[int], None]
+        get_esp32_before_reset: Callable[[], bool]
+        set_esp32_before_reset: Callable[[bool], None]
+        get_esp32_after_reset: Callable[[], bool]
+        set_esp32_after_reset: Callable[[bool], None]
+        get_esp32_no_sync: Callable[[], bool]
+        set_esp32_no_sync: Callable[[bool], None]
+        get_esp32_connect_attempts: Callable[[], int]
+        set_esp32_connect_attempts: Callable[[int], None]
+        get_esp32_auto_mode: Callable[[], bool]
+        set_esp32_auto_mode: Callable[[bool], None]
 
     def __init__(self):
         """Initialize settings manager."""
-        # Use project directory config file instead of home directory
-        project_root = Path(__file__).parent.parent.parent  # Go up to project root
-        self.config_file = project_root / ".wf_firmware_uploader_config.json"
-        self.settings = self._load_default_settings()
-        self.load_settings()
+        self.config_file = _CONFIG_FILE
+        self._settings = self._load_default_settings()
+        # Config file is read lazily on first access to settings
+        self._loaded = False
+        # Dirty tracking lets callers coalesce bursts of updates into one write
+        self._dirty = False
+        self._last_write = 0.0
+        # Digest of the last bytes written, to skip rewriting identical content
+        self._last_saved_digest: Optional[bytes] = None
+        # Tuple view of esp32.last_firmware_files, rebuilt after the list changes
+        self._esp32_files_cached: Optional[List[Tuple[str, str]]] = None
+
+    @cached_property
+    def settings(self) -> Dict[str, Any]:
+        """Settings dict, loaded from the config file on first access.
+
+        Cached in the instance dict afterwards, so every later access is a
+        plain attribute lookup rather than a property call.
+        """
+        if not self._loaded:
+            self.load_settings()
+        return self._settings
 
     def _load_default_settings(self) -> Dict[str, Any]:
         """Load default settings."""
-        return {
-            "version": "1.0",
-            "window": {"x": 100, "y": 100, "width": 1000, "height": 750},
-            "ui": {
-                "auto_platform_scale": True,  # Automatically scale based on platform
-                "scale_factor": None,  # Custom scale factor (overrides auto scaling)
-            },
-            "stm32": {
-                "last_firmware_path": "",
-                "last_port": "SWD",
-                "flash_address": "0x08000000",
-                "full_erase": False,
-                "auto_mode": False,  # Automatic mode for production workflow
-                "connection_mode": "HOTPLUG",  # HOTPLUG, UR, Normal
-                "hardware_reset": False,
-                "connection_speed": 4000,  # kHz
-                "retry_attempts": 3,
-            },
-            "esp32": {
-                "last_firmware_files": [],  # List of [address, filepath] pairs
-                "last_port": "",
-                "full_erase": False,
-                "auto_mode": False,  # Automatic mode for production workflow
-                "baud_rate": 921600,
-                "before_reset": True,  # --before default-reset
-                "after_reset": True,  # --after hard-reset
-                "no_sync": False,  # --before no-reset-no-sync
-                "connect_attempts": 1,
-            },
-            "counters": {
-                "stm32": {"total": 0, "pass": 0, "fail": 0},
-                "esp32": {"total": 0, "pass": 0, "fail": 0},
-            },
-        }
+        return _clone(_DEFAULTS)
 
     def load_settings(self) -> bool:
         """Load settings from file."""
+        self._loaded = True
         try:
-            if self.config_file.exists():
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    loaded_settings = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    self._merge_settings(self.settings, loaded_settings)
-                return True
-        except (json.JSONDecodeError, FileNotFoundError, PermissionError):
+            # A missing file surfaces as FileNotFoundError instead of costing
+            # a separate exists() stat
+            loaded_settings = _load_file(self.config_file)
+            # Merge with defaults to ensure all keys exist
+            if loaded_settings.get("version") == _DEFAULTS["version"]:
+                self._merge_same_version(loaded_settings)
+            else:
+                self._merge_settings(self._settings, loaded_settings)
+            self._esp32_files_cached = None
+            return True
+        except (json.JSONDecodeError, FileNotFoundError, PermissionError, OSError):
             # If loading fails, keep default settings
             pass
         return False
@@ -70,184 +240,156 @@ class SettingsManager:
     def save_settings(self) -> bool:
         """Save settings to file."""
         try:
-            # Create parent directory if it doesn't exist
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            # Serialize up front and swap in a fully written temp file so an
+            # interrupted save never leaves a truncated config behind.
+            # open/write/fsync/rename: one barrier per save, old file intact
+            # until the new one is durable.
+            data = _dumps(self.settings)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._last_saved_digest:
+                # File already holds exactly these bytes
+                self._dirty = False
+                return True
 
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            tmp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+            try:
+                _write_synced(tmp_file, data)
+            except FileNotFoundError:
+                # Create parent directory only when it is actually missing
+                self.config_file.parent.mkdir(parents=True, exist_ok=True)
+                _write_synced(tmp_file, data)
+            os.replace(tmp_file, self.config_file)
+            self._last_saved_digest = digest
+            self._dirty = False
+            self._last_write = time.monotonic()
             return True
         except (PermissionError, OSError):
             return False
 
-    def _merge_settings(self, target: Dict[str, Any], source: Dict[str, Any]):
-        """Merge source settings into target, preserving structure."""
-        for key, value in source.items():
-            if key in target:
-                if isinstance(target[key], dict) and isinstance(value, dict):
-                    self._merge_settings(target[key], value)
-                else:
-                    target[key] = value
-
-    # Window settings
-    def get_window_geometry(self) -> Tuple[int, int, int, int]:
-        """Get window geometry (x, y, width, height)."""
-        w = self.settings["window"]
-        return w["x"], w["y"], w["width"], w["height"]
-
-    def set_window_geometry(self, x: int, y: int, width: int, height: int):
-        """Set window geometry."""
-        self.settings["window"].update({"x": x, "y": y, "width": width, "height": height})
-
-    # STM32 settings
-    def get_stm32_last_firmware(self) -> str:
-        """Get last STM32 firmware file path."""
-        return self.settings["stm32"]["last_firmware_path"]
-
-    def set_stm32_last_firmware(self, path: str):
-        """Set last STM32 firmware file path."""
-        self.settings["stm32"]["last_firmware_path"] = path
-
-    def get_stm32_last_port(self) -> str:
-        """Get last STM32 port."""
-        return self.settings["stm32"]["last_port"]
-
-    def set_stm32_last_port(self, port: str):
-        """Set last STM32 port."""
-        self.settings["stm32"]["last_port"] = port
+    def is_dirty(self) -> bool:
+        """Return True if settings changed since the last successful save."""
+        return self._dirty
 
-    def get_stm32_flash_address(self) -> str:
-        """Get STM32 flash address."""
-        return self.settings["stm32"]["flash_address"]
+    def maybe_save(self) -> bool:
+        """Save settings only if something changed since the last save.
 
-    def set_stm32_flash_address(self, address: str):
-        """Set STM32 flash address."""
-        self.settings["stm32"]["flash_address"] = address
-
-    def get_stm32_full_erase(self) -> bool:
-        """Get STM32 full erase setting."""
-        return self.settings["stm32"]["full_erase"]
+        Returns:
+            True if settings were written to disk
+        """
+        if not self._dirty:
+            return False
+        return self.save_settings()
 
-    def set_stm32_full_erase(self, enabled: bool):
-        """Set STM32 full erase setting."""
-        self.settings["stm32"]["full_erase"] = enabled
+    def maybe_flush(self, max_delay: float = 0.5) -> bool:
+        """Save settings if dirty and the last write is older than max_delay.
 
-    def get_stm32_connection_mode(self) -> str:
-        """Get STM32 connection mode setting."""
-        return self.settings["stm32"]["connection_mode"]
+        Intended to be called from a periodic UI tick so bursts of updates
+        (e.g. counter increments) collapse into a single write.
 
-    def set_stm32_connection_mode(self, mode: str):
-        """Set STM32 connection mode setting."""
-        self.settings["stm32"]["connection_mode"] = mode
+        Args:
+            max_delay: Minimum seconds between consecutive writes
 
-    def get_stm32_hardware_reset(self) -> bool:
-        """Get STM32 hardware reset setting."""
-        return self.settings["stm32"]["hardware_reset"]
+        Returns:
+            True if settings were written to disk
+        """
+        if not self._dirty or time.monotonic() - self._last_write < max_delay:
+            return False
+        return self.save_settings()
 
-    def set_stm32_hardware_reset(self, enabled: bool):
-        """Set STM32 hardware reset setting."""
-        self.settings["stm32"]["hardware_reset"] = enabled
+    def _merge_same_version(self, source: Dict[str, Any]):
+        """Merge a config written with the current schema version.
 
-    def get_stm32_connection_speed(self) -> int:
-        """Get STM32 connection speed setting."""
-        return self.settings["stm32"]["connection_speed"]
+        Flat sections whose keys are all known take a single dict.update();
+        anything else (nested counters, stale keys) uses _merge_settings.
+        """
+        target = self._settings
+        for key, value in source.items():
+            current = target.get(key, _MISSING)
+            if current is _MISSING:
+                continue
+            if key in _FLAT_SECTIONS and type(value) is dict and value.keys() <= current.keys():
+                current.update(value)
+            elif type(current) is dict and type(value) is dict:
+                self._merge_settings(current, value)
+            else:
+                target[key] = value
 
-    def set_stm32_connection_speed(self, speed: int):
-        """Set STM32 connection speed setting."""
-        self.settings["stm32"]["connection_speed"] = speed
+    def _merge_settings(self, target: Dict[str, Any], source: Dict[str, Any]):
+        """Merge source settings into target, preserving structure.
 
-    def get_stm32_retry_attempts(self) -> int:
-        """Get STM32 retry attempts setting."""
-        return self.settings["stm32"]["retry_attempts"]
+        Walks nested sections with an explicit stack instead of recursion and
+        applies each level's leaf values with a single dict.update().
+        Keys unknown to target are ignored.
+        """
+        stack = [(target, source)]
+        while stack:
+            dst, src = stack.pop()
+            dst_get = dst.get
+            leaves = {}
+            for key, value in src.items():
+                # One probe for both the membership test and the value
+                current = dst_get(key, _MISSING)
+                if current is _MISSING:
+                    continue
+                # Settings are plain JSON data, so exact type checks suffice
+                if type(current) is dict and type(value) is dict:
+                    stack.append((current, value))
+                else:
+                    leaves[key] = value
+            dst.update(leaves)
 
-    def set_stm32_retry_attempts(self, attempts: int):
-        """Set STM32 retry attempts setting."""
-        self.settings["stm32"]["retry_attempts"] = max(1, attempts)
+    def _set(self, section: str, key: str, value: Any):
+        """Store a value and mark settings dirty only if it actually changed."""
+        values = self.settings[section]
+        if key not in values or values[key] != value:
+            values[key] = value
+            self._dirty = True
 
-    def get_stm32_auto_mode(self) -> bool:
-        """Get STM32 automatic mode setting."""
-        return self.settings["stm32"].get("auto_mode", False)
+    # Window settings
+    def get_window_geometry(self) -> Tuple[int, int, int, int]:
+        """Get window geometry (x, y, width, height)."""
+        w = self.settings["window"]
+        return w["x"], w["y"], w["width"], w["height"]
 
-    def set_stm32_auto_mode(self, enabled: bool):
-        """Set STM32 automatic mode setting."""
-        self.settings["stm32"]["auto_mode"] = enabled
+    def set_window_geometry(self, x: int, y: int, width: int, height: int):
+        """Set window geometry."""
+        geometry = {"x": x, "y": y, "width": width, "height": height}
+        window = self.settings["window"]
+        if any(window.get(key) != value for key, value in geometry.items()):
+            window.update(geometry)
+            self._dirty = True
 
     # ESP32 settings
     def get_esp32_last_firmware_files(self) -> List[Tuple[str, str]]:
-        """Get last ESP32 firmware files as list of (address, filepath) tuples."""
-        return list(self.settings["esp32"]["last_firmware_files"])
+        """Get last ESP32 firmware files as list of (address, filepath) tuples.
+
+        The returned list is cached and shared between calls; do not mutate it.
+        """
+        if self._esp32_files_cached is None:
+            self._esp32_files_cached = [
+                (addr, path) for addr, path in self.settings["esp32"]["last_firmware_files"]
+            ]
+        return self._esp32_files_cached
 
     def set_esp32_last_firmware_files(self, files: List[Tuple[str, str]]):
         """Set last ESP32 firmware files."""
+        stored = self.settings["esp32"]["last_firmware_files"]
+        # UI auto-save passes the same files repeatedly; compare pairwise
+        # without building a new list before deciding anything changed
+        if len(stored) == len(files) and all(
+            old_addr == addr and old_path == path
+            for (old_addr, old_path), (addr, path) in zip(stored, files)
+        ):
+            return
+        # Always store fresh [address, path] lists so callers never alias settings
         self.settings["esp32"]["last_firmware_files"] = [[addr, path] for addr, path in files]
-
-    def get_esp32_last_port(self) -> str:
-        """Get last ESP32 port."""
-        return self.settings["esp32"]["last_port"]
-
-    def set_esp32_last_port(self, port: str):
-        """Set last ESP32 port."""
-        self.settings["esp32"]["last_port"] = port
-
-    def get_esp32_full_erase(self) -> bool:
-        """Get ESP32 full erase setting."""
-        return self.settings["esp32"]["full_erase"]
-
-    def set_esp32_full_erase(self, enabled: bool):
-        """Set ESP32 full erase setting."""
-        self.settings["esp32"]["full_erase"] = enabled
-
-    def get_esp32_baud_rate(self) -> int:
-        """Get ESP32 baud rate setting."""
-        return self.settings["esp32"]["baud_rate"]
-
-    def set_esp32_baud_rate(self, baud_rate: int):
-        """Set ESP32 baud rate setting."""
-        self.settings["esp32"]["baud_rate"] = baud_rate
-
-    def get_esp32_before_reset(self) -> bool:
-        """Get ESP32 before reset setting."""
-        return self.settings["esp32"]["before_reset"]
-
-    def set_esp32_before_reset(self, enabled: bool):
-        """Set ESP32 before reset setting."""
-        self.settings["esp32"]["before_reset"] = enabled
-
-    def get_esp32_after_reset(self) -> bool:
-        """Get ESP32 after reset setting."""
-        return self.settings["esp32"]["after_reset"]
-
-    def set_esp32_after_reset(self, enabled: bool):
-        """Set ESP32 after reset setting."""
-        self.settings["esp32"]["after_reset"] = enabled
-
-    def get_esp32_no_sync(self) -> bool:
-        """Get ESP32 no-sync setting."""
-        return self.settings["esp32"]["no_sync"]
-
-    def set_esp32_no_sync(self, enabled: bool):
-        """Set ESP32 no-sync setting."""
-        self.settings["esp32"]["no_sync"] = enabled
-
-    def get_esp32_connect_attempts(self) -> int:
-        """Get ESP32 connect attempts setting."""
-        return self.settings["esp32"]["connect_attempts"]
-
-    def set_esp32_connect_attempts(self, attempts: int):
-        """Set ESP32 connect attempts setting."""
-        self.settings["esp32"]["connect_attempts"] = max(1, attempts)
-
-    def get_esp32_auto_mode(self) -> bool:
-        """Get ESP32 automatic mode setting."""
-        return self.settings["esp32"].get("auto_mode", False)
-
-    def set_esp32_auto_mode(self, enabled: bool):
-        """Set ESP32 automatic mode setting."""
-        self.settings["esp32"]["auto_mode"] = enabled
+        self._esp32_files_cached = None
+        self._dirty = True
 
     # Validation helpers
     def validate_file_exists(self, filepath: str) -> bool:
         """Check if file exists."""
-        return bool(filepath and Path(filepath).exists())
+        return bool(filepath) and os.path.exists(filepath)
 
     def cleanup_missing_files(self):
         """Remove missing files from settings."""
@@ -298,11 +440,17 @@ class SettingsManager:
         if device_key not in self.settings["counters"]:
             self.settings["counters"][device_key] = {}
 
-        self.settings["counters"][device_key] = {
-            "total": total,
-            "pass": passed,
-            "fail": failed,
-        }
+        counters = {"total": total, "pass": passed, "fail": failed}
+        if self.settings["counters"][device_key] != counters:
+            self.settings["counters"][device_key] = counters
+            self._dirty = True
+
+    def _counter_entry(self, device_type: str) -> Dict[str, int]:
+        """Return the mutable counter dict for device type, creating it if missing."""
+        counters = self.settings["counters"].setdefault(device_type.lower(), {})
+        for key in ("total", "pass", "fail"):
+            counters.setdefault(key, 0)
+        return counters
 
     def increment_counter_pass(self, device_type: str):
         """Increment pass counter for device type.
@@ -310,8 +458,10 @@ class SettingsManager:
         Args:
             device_type: "stm32" or "esp32"
         """
-        total, passed, failed = self.get_counters(device_type)
-        self.set_counters(device_type, total + 1, passed + 1, failed)
+        counters = self._counter_entry(device_type)
+        counters["total"] += 1
+        counters["pass"] += 1
+        self._dirty = True
 
     def increment_counter_fail(self, device_type: str):
         """Increment fail counter for device type.
@@ -319,8 +469,10 @@ class SettingsManager:
         Args:
             device_type: "stm32" or "esp32"
         """
-        total, passed, failed = self.get_counters(device_type)
-        self.set_counters(device_type, total + 1, passed, failed + 1)
+        counters = self._counter_entry(device_type)
+        counters["total"] += 1
+        counters["fail"] += 1
+        self._dirty = True
 
     def reset_counters(self, device_type: str):
         """Reset all counters for device type to zero.
@@ -329,3 +481,37 @@ class SettingsManager:
             device_type: "stm32" or "esp32"
         """
         self.set_counters(device_type, 0, 0, 0)
+
+
+def _make_accessors(section: str, key: str, doc: str):
+    """Build the getter/setter pair for one _SCHEMA entry."""
+
+    def getter(self: SettingsManager) -> Any:
+        return self.settings[section][key]
+
+    bounds = _BOUNDS.get(f"{section}.{key}")
+    if bounds is None:
+
+        def setter(self: SettingsManager, value: Any):
+            self._set(section, key, value)
+
+    else:
+        low, high = bounds
+
+        def setter(self: SettingsManager, value: Any):
+            self._set(section, key, min(max(value, low), high))
+
+    getter.__doc__ = f"Get {doc}."
+    setter.__doc__ = f"Set {doc}."
+    return getter, setter
+
+
+for _name, _spec in _SCHEMA.items():
+    _getter, _setter = _make_accessors(*_spec)
+    _getter.__name__ = f"get_{_name}"
+    _getter.__qualname__ = f"SettingsManager.get_{_name}"
+    _setter.__name__ = f"set_{_name}"
+    _setter.__qualname__ = f"SettingsManager.set_{_name}"
+    setattr(SettingsManager, f"get_{_name}", _getter)
+    setattr(SettingsManager, f"set_{_name}", _setter)
+del _name, _spec, _getter, _setter
@@ -1,10 +1,22 @@
 """STM32 firmware upload module."""
 
+import asyncio
+import codecs
+import concurrent.futures
+import functools
+import hashlib
+import mmap
 import os
 import platform
+import re
+import shutil
 import subprocess
-from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # Use winreg only on Windows
 if platform.system() == "Windows":
@@ -15,6 +27,25 @@ if platform.system() == "Windows":
 else:
     WINREG = None  # type: ignore
 
+# psutil (optional) kills stray CLI processes in-process instead of via taskkill/pkill
+try:
+    import psutil as PSUTIL  # type: ignore
+except ImportError:
+    PSUTIL = None  # type: ignore
+
+# pyusb (optional) lets automatic mode see whether any ST-Link is plugged in
+# without launching the CLI; without it every poll goes through the CLI
+try:
+    import usb.core as USB_CORE  # type: ignore
+except ImportError:
+    USB_CORE = None  # type: ignore
+
+# pyudev (optional, Linux) wakes automatic mode as soon as an ST-Link is plugged in
+try:
+    import pyudev as PYUDEV  # type: ignore
+except ImportError:
+    PYUDEV = None  # type: ignore
+
 # Windows: Hide console window for subprocess calls
 # Prevents CMD windows from flashing when calling STM32_Programmer_CLI
 if platform.system() == "Windows":
@@ -22,115 +53,592 @@ if platform.system() == "Windows":
 else:
     CREATE_NO_WINDOW = 0  # Not needed on Linux/Mac
 
+# Extra keyword arguments for every subprocess started here. On Linux/Mac the
+# CLI gets its own session so a Ctrl-C in the terminal can't interrupt a
+# flash write halfway and leave the SWD link locked.
+if platform.system() == "Windows":
+    _SUBPROCESS_KW: Dict[str, Any] = {"creationflags": CREATE_NO_WINDOW}
+else:
+    _SUBPROCESS_KW = {"start_new_session": True}
+
+# ST-Link V1/V2/V2-1/V3 USB IDs
+_STLINK_VID = 0x0483
+_STLINK_PIDS = frozenset(
+    {0x3744, 0x3748, 0x374A, 0x374B, 0x374D, 0x374E, 0x374F, 0x3752, 0x3753, 0x3754, 0x3757}
+)
+
+# How long an is_stm32_programmer_cli_available() result is reused (seconds)
+_AVAILABILITY_TTL = 30.0
+
+# Reported when launching the CLI fails; there is no up-front --version probe
+_CLI_NOT_FOUND = "Error: STM32_Programmer_CLI not found"
+
+# Line terminators recognised in CLI output (matches text-mode universal newlines)
+_LINE_SPLIT_RE = re.compile(r"\r\n?|\n")
+
+# Take whatever the pipe has buffered, up to the StreamReader's 64 KiB limit,
+# so bursts of verbose output are split and decoded in a few large passes
+_READ_CHUNK_SIZE = 64 * 1024
+
+# How often a quiet CLI is reported as still alive when an idle timeout is set
+_IDLE_NOTICE_INTERVAL = 2.0
+# Longest the output pump waits before re-checking stop_flag
+_STOP_POLL_INTERVAL = 0.25
+
+# Progress-line classification, compiled once instead of chained substring scans
+_PROGRESS_BAR_CHARS = frozenset("█▓▒░%")
+_PERCENT_RE = re.compile(r"([\d.]+)%")
+_STATUS_MESSAGES = {
+    "Memory Programming": "Programming flash memory...",
+    "Download verified successfully": "Verification complete",
+    "RUNNING": "Firmware uploaded successfully",
+    "Download in Progress": "Starting download...",
+}
+_STATUS_RE = re.compile("|".join(map(re.escape, _STATUS_MESSAGES)))
+
+# Device details reported by the option-bytes query
+_DEVICE_INFO_KEYS = {"Device ID": "device_id", "Flash size": "flash_size"}
+_DEVICE_INFO_RE = re.compile(r"(Device ID|Flash size)[ \t]*:(.*)")
+
+
+class _ProgressCoalescer:
+    """Collapse bursts of percent updates into at most one callback per interval.
+
+    Other messages are delivered immediately, after any held-back percentage,
+    so ordering is preserved and only superseded percentages are dropped.
+    A message identical to the one delivered last is skipped.
+    """
+
+    def __init__(self, callback: Callable[[str], None], interval: float = 0.05):
+        self.callback = callback
+        self.interval = interval
+        self._last_emit = 0.0
+        self._last_message: Optional[str] = None
+        self._pending: Optional[str] = None
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether a percentage is waiting to be delivered."""
+        return self._pending is not None
+
+    def offer(self, message: str, coalesce: bool = False):
+        """Deliver ``message``, or hold it if it is a percentage arriving too soon."""
+        if not coalesce:
+            self.flush()
+            self._deliver(message)
+            return
+
+        if message == self._last_message:
+            # Flat stretch of the progress bar; anything held back is superseded
+            self._pending = None
+            return
+
+        now = time.monotonic()
+        if now - self._last_emit >= self.interval:
+            self._pending = None
+            self._last_emit = now
+            self._deliver(message)
+        else:
+            self._pending = message
+
+    def flush(self):
+        """Deliver the held-back percentage, if any."""
+        if self._pending is not None:
+            message, self._pending = self._pending, None
+            self._last_emit = time.monotonic()
+            self._deliver(message)
+
+    def _deliver(self, message: str):
+        if message != self._last_message:
+            self._last_message = message
+            self.callback(message)
+
+
+@dataclass(frozen=True, slots=True)
+class _CmdBuilder:
+    """Builds STM32_Programmer_CLI command lines for one port/mode connection.
+
+    ``sn`` selects one ST-Link by serial number when several are plugged in;
+    without it the CLI uses the first probe it finds.
+    """
+
+    cli: str
+    port: str
+    mode: str
+    sn: Optional[str] = None
+    _prefix: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Formatted once; every command line starts with the same connection
+        selector = (f"sn={self.sn}",) if self.sn else ()
+        object.__setattr__(
+            self,
+            "_prefix",
+            (self.cli, "-c", f"port={self.port}", *selector, "-c", f"mode={self.mode}"),
+        )
+
+    def connect(self, *args: str) -> List[str]:
+        """Connect to the target, then run ``args``."""
+        return [*self._prefix, *args]
+
+    def probe(self, freq: int) -> List[str]:
+        """Connect only, to check whether an MCU is attached."""
+        return self.connect("-c", f"freq={freq}")
+
+    def upload(
+        self, firmware: str, address: str, freq: int, hardware_reset: bool, verify: bool = True
+    ) -> List[str]:
+        """Write, optionally verify, and start ``firmware``."""
+        args = []
+        # Only add connection speed if not default
+        if freq != 4000:
+            args += ["-c", f"freq={freq}"]
+        if hardware_reset:
+            args += ["-c", "reset=HWrst"]
+        # Use -s (start/run) instead of -rst to properly release SWD connection
+        # -s makes the MCU run and releases debugger, preventing connection lock
+        write = ["-w", firmware, address]
+        if verify:
+            write.append("-v")
+        return self.connect(*args, *write, "-s")
+
+    def hardware_reset(self) -> List[str]:
+        """Hardware-reset the target through the ST-Link."""
+        return self.connect("-c", "reset=HWrst")
+
+    def read_back(self, address: str, size: int, output: str) -> List[str]:
+        """Read ``size`` bytes of flash at ``address`` into the file ``output``."""
+        return self.connect("--upload", address, str(size), output)
+
+    def erase(self) -> List[str]:
+        """Mass-erase the flash."""
+        return self.connect("-e", "all")
+
+
+def _find_file_in(directory: str, name: str) -> Optional[str]:
+    """Return the path of ``name`` inside ``directory`` if it is a regular file.
+
+    A missing install root fails on the single scandir call, and the
+    directory entry already says whether the match is a file.
+    """
+    target = os.path.normcase(name)
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if os.path.normcase(entry.name) == target and entry.is_file():
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+# Short STM32_Programmer_CLI calls share one bounded pool across uploaders
+_CLI_POOL_SIZE = 4
+_CLI_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=_CLI_POOL_SIZE, thread_name_prefix="stm32cli"
+)
+
+
+def _run_cli(cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+    """Run a short, non-streaming CLI command on the shared pool and wait for it.
+
+    ``timeout`` starts when the CLI is launched; time spent waiting for a free
+    worker doesn't count against it, so a busy pool delays a probe but never
+    makes one that would succeed time out.
+
+    Raises whatever subprocess.run raises (TimeoutExpired, FileNotFoundError, ...).
+    """
+    future = _CLI_POOL.submit(
+        subprocess.run,
+        cmd,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+        **_SUBPROCESS_KW,
+    )
+    return future.result()
+
+
+# STM32_Programmer_CLI install locations as (bin directory, executable name)
+_WINDOWS_CLI_CANDIDATES = (
+    (
+        r"C:\Program Files\STMicroelectronics\STM32Cube\STM32CubeProgrammer\bin",
+        "STM32_Programmer_CLI.exe",
+    ),
+    (
+        r"C:\Program Files (x86)\STMicroelectronics\STM32Cube\STM32CubeProgrammer\bin",
+        "STM32_Programmer_CLI.exe",
+    ),
+)
+_LINUX_CLI_CANDIDATES = (
+    (
+        "/opt/st/stm32cubeide_1.14.1/plugins/"
+        "com.st.stm32cube.ide.mcu.externaltools.cubeprogrammer.linux64_2.1.400.202401151627"
+        "/tools/bin",
+        "STM32_Programmer_CLI",
+    ),
+    ("/usr/local/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin", "STM32_Programmer_CLI"),
+    (
+        "/home/" + os.getenv("USER", "") + "/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin",
+        "STM32_Programmer_CLI",
+    ),
+    # WSL access to Windows installation
+    (
+        "/mnt/c/Program Files/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin",
+        "STM32_Programmer_CLI.exe",
+    ),
+    (
+        "/mnt/c/Program Files (x86)/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin",
+        "STM32_Programmer_CLI.exe",
+    ),
+)
+
+
+def _first_found(candidates) -> Optional[str]:
+    """Return the first ``(directory, name)`` candidate that exists, in list order.
+
+    The directories are scanned concurrently; on WSL each ``/mnt/c`` lookup is a
+    slow 9P round trip, so a miss on every candidate costs one round trip, not five.
+    Uses its own short-lived pool so the scan never queues behind CLI calls on
+    _CLI_POOL (or deadlocks when run from one).
+    """
+    if not candidates:
+        return None
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=len(candidates), thread_name_prefix="stm32find"
+    ) as executor:
+        found = list(executor.map(lambda candidate: _find_file_in(*candidate), candidates))
+    return next(filter(None, found), None)
+
+
+def _registry_install_roots() -> List[str]:
+    """Return STM32CubeProgrammer install directories listed in the Windows registry.
+
+    Looks at ``SOFTWARE\\STMicroelectronics\\STM32CubeProgrammer`` (and the 32-bit
+    view) and its version subkeys for an ``InstallPath`` value.
+    """
+    if not WINREG:
+        return []
+
+    roots = []
+    for key_path in (
+        r"SOFTWARE\STMicroelectronics\STM32CubeProgrammer",
+        r"SOFTWARE\WOW6432Node\STMicroelectronics\STM32CubeProgrammer",
+    ):
+        try:
+            with WINREG.OpenKey(WINREG.HKEY_LOCAL_MACHINE, key_path) as key:  # type: ignore
+                subkeys = [key_path]
+                index = 0
+                while True:
+                    try:
+                        subkeys.append(key_path + "\\" + WINREG.EnumKey(key, index))  # type: ignore
+                    except OSError:
+                        break
+                    index += 1
+        except OSError:
+            continue
+
+        for subkey_path in subkeys:
+            try:
+                with WINREG.OpenKey(  # type: ignore
+                    WINREG.HKEY_LOCAL_MACHINE, subkey_path
+                ) as subkey:
+                    value, _ = WINREG.QueryValueEx(subkey, "InstallPath")  # type: ignore
+            except OSError:
+                continue
+            if isinstance(value, str) and value:
+                roots.append(value)
+    return roots
+
+
+@functools.lru_cache(maxsize=1)
+def _find_stm32_programmer_cli(system_type: str) -> str:
+    """Find STM32_Programmer_CLI path on Windows/Linux.
+
+    Cached per platform: the install location does not change while the
+    application runs, so the filesystem is probed once per process.
+    """
+    if system_type == "Windows":
+        # Check paths in order
+        path = _first_found(_WINDOWS_CLI_CANDIDATES)
+        if path:
+            return path
+
+        # Search install locations recorded in the registry (non-default installs)
+        path = _first_found(
+            [
+                (os.path.join(root, "bin"), "STM32_Programmer_CLI.exe")
+                for root in _registry_install_roots()
+            ]
+        )
+        if path:
+            return path
+
+        return shutil.which("STM32_Programmer_CLI.exe") or "STM32_Programmer_CLI.exe"
+
+    # Check Linux/WSL paths, then PATH
+    path = _first_found(_LINUX_CLI_CANDIDATES)
+    return path or shutil.which("STM32_Programmer_CLI") or "STM32_Programmer_CLI"
+
+
+def _sha256_file(path: str) -> str:
+    """Return the hex SHA-256 of the file at ``path``, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _crc32_file(path: str) -> int:
+    """Return the zlib CRC-32 of the file at ``path`` in a single call over an mmap."""
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return zlib.crc32(mapped)
+        except ValueError:
+            # Empty files can't be mapped
+            return zlib.crc32(b"")
+
+
+def _firmware_integrity_error(
+    path: str, expected_sha256: Optional[str], expected_crc32: Optional[int]
+) -> Optional[str]:
+    """Check ``path`` against the expected checksums; return an error message or None."""
+    try:
+        if expected_crc32 is not None:
+            actual_crc32 = _crc32_file(path)
+            if actual_crc32 != expected_crc32 & 0xFFFFFFFF:
+                return (
+                    f"Error: Firmware checksum mismatch (CRC-32 {actual_crc32:08x}, "
+                    f"expected {expected_crc32 & 0xFFFFFFFF:08x})"
+                )
+        if expected_sha256:
+            actual_sha256 = _sha256_file(path)
+            if actual_sha256 != expected_sha256.strip().lower():
+                return (
+                    f"Error: Firmware checksum mismatch (SHA-256 {actual_sha256}, "
+                    f"expected {expected_sha256})"
+                )
+    except OSError as e:
+        return f"Error: Cannot read firmware file: {str(e)}"
+    return None
+
+
+def _stlink_attached() -> Optional[bool]:
+    """Return whether an ST-Link probe is on USB, or None if that can't be told."""
+    if USB_CORE is None:
+        return None
+    try:
+        devices = USB_CORE.find(find_all=True, idVendor=_STLINK_VID)
+        return any(device.idProduct in _STLINK_PIDS for device in devices)
+    except (ValueError, OSError):
+        # No libusb backend (NoBackendError is a ValueError) or no permission
+        return None
+
+
+def _stlink_gate_applies(port: str, cli: str) -> bool:
+    """Return whether _stlink_attached() says anything about reaching ``port``.
+
+    Only SWD/JTAG go through an ST-Link; serial ports use the UART bootloader.
+    Under WSL the probe is driven by the Windows CLI and usually isn't visible
+    on the Linux USB bus at all.
+    """
+    if port.upper() not in ("SWD", "JTAG"):
+        return False
+    if platform.system() != "Windows" and (
+        cli.lower().endswith(".exe") or "WSL_DISTRO_NAME" in os.environ
+    ):
+        return False
+    return True
+
+
+def _usb_hotplug_monitor():
+    """Return a started udev monitor for USB device events, or None if unavailable."""
+    if PYUDEV is None:
+        return None
+    try:
+        monitor = PYUDEV.Monitor.from_netlink(PYUDEV.Context())
+        monitor.filter_by(subsystem="usb", device_type="usb_device")
+        monitor.start()
+        return monitor
+    except (ImportError, OSError):
+        # No libudev on this system or netlink socket not permitted
+        return None
+
+
+def _wait_for_stlink_arrival(timeout: float):
+    """Sleep up to ``timeout`` seconds, returning early when an ST-Link is plugged in.
+
+    The udev monitor only lives for this wait: pyudev has no close() and frees
+    the netlink socket when the last reference goes, so nothing stays open (or
+    queues events) while an upload runs. An arrival between waits is still
+    picked up by the next CLI probe.
+    """
+    monitor = _usb_hotplug_monitor()
+    if monitor is None:
+        time.sleep(timeout)
+        return
+    try:
+        deadline = time.monotonic() + timeout
+        vendor_id = f"{_STLINK_VID:04x}"
+        while (remaining := deadline - time.monotonic()) > 0:
+            device = monitor.poll(timeout=remaining)
+            if device is None:
+                return
+            if device.action == "add" and device.get("ID_VENDOR_ID") == vendor_id:
+                return
+    finally:
+        # Drop the only reference so the socket is released now
+        del monitor
+
+
+def invalidate_cli_cache():
+    """Forget the cached STM32_Programmer_CLI location, e.g. after an install or config change."""
+    _find_stm32_programmer_cli.cache_clear()
+
+
+class UploadStatus(IntEnum):
+    """Result of an automatic-mode session; compares equal to the old 0/1/2 codes."""
+
+    FAILURE = 0
+    SUCCESS = 1
+    STOPPED = 2
+
 
 class STM32Uploader:
     """Class responsible for STM32 firmware upload."""
 
+    __slots__ = (
+        "_cli_path",
+        "stop_flag",
+        "_availability",
+        "kill_stray_processes",
+        "probe_sn",
+        "_builders",
+    )
+
     def __init__(self):
         """Initialize STM32Uploader."""
-        self.stm32_programmer_cli = self._find_stm32_programmer_cli()
+        # Resolved on first use so building an uploader never touches the filesystem
+        self._cli_path: Optional[str] = None
         self.stop_flag = False
+        # (monotonic timestamp, result) of the last availability check
+        self._availability: Optional[Tuple[float, bool]] = None
+        # Kill stray STM32_Programmer_CLI processes after an upload. Must be off
+        # when other uploads run concurrently, or they would be killed too.
+        self.kill_stray_processes = True
+        # Serial number of the ST-Link to use over SWD/JTAG; None means the first one
+        self.probe_sn: Optional[str] = None
+        self._builders: Dict[Tuple[str, str, str, Optional[str]], _CmdBuilder] = {}
+
+    @property
+    def stm32_programmer_cli(self) -> str:
+        """Path of STM32_Programmer_CLI, located on first access."""
+        if self._cli_path is None:
+            self._cli_path = _find_stm32_programmer_cli(platform.system())
+        return self._cli_path
+
+    @stm32_programmer_cli.setter
+    def stm32_programmer_cli(self, path: str):
+        self._cli_path = path
+
+    def _builder(self, port: str, mode: str) -> _CmdBuilder:
+        """Return the command builder for ``port``/``mode``, reused across calls."""
+        key = (self.stm32_programmer_cli, port, mode, self.probe_sn)
+        builder = self._builders.get(key)
+        if builder is None:
+            builder = self._builders[key] = _CmdBuilder(*key)
+        return builder
+
+    def invalidate_cache(self):
+        """Forget the cached CLI path and availability so both are probed again."""
+        invalidate_cli_cache()
+        self._cli_path = None
+        self._availability = None
+        self._builders.clear()
 
-    def _find_stm32_programmer_cli(self) -> str:
-        """Find STM32_Programmer_CLI path on Windows/Linux."""
-        system_type = platform.system()
-
-        if system_type == "Windows":
-            # Windows installation paths
-            default_paths = [
-                (
-                    r"C:\Program Files\STMicroelectronics\STM32Cube"
-                    r"\STM32CubeProgrammer\bin\STM32_Programmer_CLI.exe"
-                ),
-                (
-                    r"C:\Program Files (x86)\STMicroelectronics\STM32Cube"
-                    r"\STM32CubeProgrammer\bin\STM32_Programmer_CLI.exe"
-                ),
-            ]
+    def is_stm32_programmer_cli_available(self) -> bool:
+        """Check if STM32_Programmer_CLI is available.
 
-            # Check paths in order
-            for path in default_paths:
-                if os.path.exists(path):
-                    return path
+        Intended for explicit preflight checks; the upload, erase and probe
+        methods don't call it and report a missing CLI when launching it fails.
+        """
+        cached = self._availability
+        if cached is not None and time.monotonic() - cached[0] < _AVAILABILITY_TTL:
+            return cached[1]
 
-            # Search in registry (Windows only)
-            if WINREG:
-                try:
-                    with WINREG.OpenKey(  # type: ignore
-                        WINREG.HKEY_LOCAL_MACHINE, "SOFTWARE\\STMicroelectronics"  # type: ignore
-                    ) as _:
-                        pass
-                except FileNotFoundError:
-                    pass
+        # Neither on PATH nor an existing executable: nothing worth launching
+        if shutil.which(self.stm32_programmer_cli) is None:
+            available = False
+        else:
+            try:
+                result = _run_cli([self.stm32_programmer_cli, "--version"], timeout=10)
+                available = result.returncode == 0
+            except (subprocess.TimeoutExpired, OSError):
+                available = False
 
-            return "STM32_Programmer_CLI.exe"
+        self._availability = (time.monotonic(), available)
+        return available
 
-        else:
-            # Linux/WSL paths
-            linux_paths = [
-                "/opt/st/stm32cubeide_1.14.1/plugins/com.st.stm32cube.ide.mcu.externaltools.cubeprogrammer.linux64_2.1.400.202401151627/tools/bin/STM32_Programmer_CLI",
-                "/usr/local/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin/STM32_Programmer_CLI",
-                "/home/" + os.getenv("USER", "") + "/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin/STM32_Programmer_CLI",
-                # WSL access to Windows installation
-                "/mnt/c/Program Files/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin/STM32_Programmer_CLI.exe",
-                "/mnt/c/Program Files (x86)/STMicroelectronics/STM32Cube/STM32CubeProgrammer/bin/STM32_Programmer_CLI.exe",
-            ]
+    def get_device_info(self, port: str) -> Optional[Dict[str, Any]]:
+        """Get STM32 device information."""
+        try:
+            result = _run_cli(self._device_info_cmd(port), timeout=15)
+            # The CLI launched, so a later preflight check needn't spawn --version
+            self._availability = (time.monotonic(), True)
+
+            if result.returncode == 0:
+                return self._parse_device_info(result.stdout)
+            return None
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
 
-            # Check Linux/WSL paths
-            for path in linux_paths:
-                if os.path.exists(path):
-                    return path
+    async def get_device_info_many(self, ports: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get STM32 device information for several ports concurrently.
 
-            # Try common alternative names
-            return "STM32_Programmer_CLI"
+        Returns:
+            Mapping of each port to its device info, or None if the probe failed
+        """
+        results = await asyncio.gather(*(self._probe_device_info(port) for port in ports))
+        return dict(zip(ports, results))
 
-    def is_stm32_programmer_cli_available(self) -> bool:
-        """Check if STM32_Programmer_CLI is available."""
+    async def _probe_device_info(self, port: str) -> Optional[Dict[str, Any]]:
+        """Async counterpart of get_device_info for a single port."""
         try:
-            result = subprocess.run(
-                [self.stm32_programmer_cli, "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                check=False,
-                creationflags=CREATE_NO_WINDOW,
+            process = await asyncio.create_subprocess_exec(
+                *self._device_info_cmd(port),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **_SUBPROCESS_KW,
             )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
-
-    def get_device_info(self, port: str) -> Optional[Dict[str, Any]]:
-        """Get STM32 device information."""
-        if not self.is_stm32_programmer_cli_available():
+        except (FileNotFoundError, OSError):
             return None
 
         try:
-            cmd = [
-                self.stm32_programmer_cli,
-                "-c",
-                "port=SWD",
-                "-c",
-                "mode=HOTPLUG",
-                "--get",
-                "option_bytes",
-            ]
-            if port:
-                cmd[2] = f"port={port}"
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=15)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return None
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15, check=False, creationflags=CREATE_NO_WINDOW)
+        if process.returncode == 0:
+            return self._parse_device_info(stdout.decode("utf-8", errors="ignore"))
+        return None
 
-            if result.returncode == 0:
-                info: Dict[str, Any] = {"connected": True}
-                # Extract information from output
-                for line in result.stdout.split("\n"):
-                    if "Device ID:" in line:
-                        info["device_id"] = line.split("Device ID:")[1].strip()
-                    elif "Flash size:" in line:
-                        info["flash_size"] = line.split("Flash size:")[1].strip()
-                return info
-            return None
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None
+    def _device_info_cmd(self, port: str) -> List[str]:
+        """Build the option-bytes query used to identify a connected device."""
+        builder = self._builder(port or "SWD", "HOTPLUG")
+        return builder.connect("--get", "option_bytes")
+
+    @staticmethod
+    def _parse_device_info(output: str) -> Dict[str, Any]:
+        """Extract device details from option-bytes query output."""
+        info: Dict[str, Any] = {"connected": True}
+        for label, value in _DEVICE_INFO_RE.findall(output):
+            info[_DEVICE_INFO_KEYS[label]] = value.strip()
+        return info
 
     def upload_firmware(
         self,
@@ -143,21 +651,42 @@ class STM32Uploader:
         connection_speed: int = 4000,
         retry_attempts: int = 3,
         auto_mode: bool = False,
-    ) -> bool:
+        verify: bool = True,
+        skip_if_unchanged: bool = False,
+        expected_sha256: Optional[str] = None,
+        expected_crc32: Optional[int] = None,
+        idle_timeout: float = 30.0,
+        overall_timeout: float = 300.0,
+    ) -> Union[bool, UploadStatus]:
         """Upload STM32 firmware.
 
+        Returns a bool, or an :class:`UploadStatus` when ``auto_mode`` is set.
+
         Args:
             auto_mode: If True, waits for MCU connection and auto-uploads.
                       This is the "Automatic mode" from STM32CubeProgrammer.
+            verify: If False, skip the read-back verification (-v). Roughly
+                    halves upload time; the write itself is unchanged.
+            skip_if_unchanged: If True, first read the target's flash back and skip
+                    erase/program when it already matches the file. Raw .bin
+                    images only; other formats are always written.
+            expected_sha256: If given, the file's SHA-256 (hex) must match before
+                    anything is sent to the programmer.
+            expected_crc32: Same as expected_sha256 but with a (much cheaper)
+                    CRC-32, as returned by zlib.crc32.
+            idle_timeout: Abort an upload attempt after this many seconds
+                    without CLI output (e.g. the probe was unplugged).
+            overall_timeout: Hard cap in seconds on a single upload attempt.
         """
         if not os.path.exists(firmware_path):
             if progress_callback:
                 progress_callback(f"Error: Firmware file not found: {firmware_path}")
             return False
 
-        if not self.is_stm32_programmer_cli_available():
+        integrity_error = _firmware_integrity_error(firmware_path, expected_sha256, expected_crc32)
+        if integrity_error:
             if progress_callback:
-                progress_callback("Error: STM32_Programmer_CLI not found")
+                progress_callback(integrity_error)
             return False
 
         # Use automatic mode if requested
@@ -170,12 +699,24 @@ class STM32Uploader:
                 hardware_reset,
                 connection_speed,
                 progress_callback,
+                verify,
+                skip_if_unchanged,
             )
 
-        try:
-            import time
+        # The command lines don't change between attempts, so build them once
+        builder = self._builder(port, connection_mode)
+        check_cmd = builder.probe(connection_speed)
+        cmd = builder.upload(firmware_path, flash_address, connection_speed, hardware_reset, verify)
 
-            # Build command with configurable options
+        start_messages = [
+            f"Starting STM32 upload: {os.path.basename(firmware_path)}",
+            f"Port: {port}, Address: {flash_address}",
+            f"Mode: {connection_mode}, Speed: {connection_speed}kHz",
+        ]
+        if hardware_reset:
+            start_messages.append("Hardware reset enabled")
+
+        try:
             for attempt in range(retry_attempts):
                 # Pre-connection check - wait for MCU to be ready
                 # This gives the user time to connect the MCU if not already connected
@@ -183,7 +724,9 @@ class STM32Uploader:
                 if attempt == 0:
                     if progress_callback:
                         progress_callback(f"{connection_mode} mode: Checking for MCU connection...")
-                        progress_callback("If MCU is not connected, please connect and power it on now")
+                        progress_callback(
+                            "If MCU is not connected, please connect and power it on now"
+                        )
                         progress_callback("Waiting up to 15 seconds for MCU connection...")
 
                     # Poll for MCU connection with timeout
@@ -194,98 +737,71 @@ class STM32Uploader:
                     mcu_connected = False
                     for poll in range(max_polls):
                         # Quick connection check
-                        check_cmd = [
-                            self.stm32_programmer_cli,
-                            "-c",
-                            f"port={port}",
-                            "-c",
-                            f"mode={connection_mode}",
-                            "-c",
-                            f"freq={connection_speed}",
-                        ]
-
                         try:
-                            result = subprocess.run(
-                                check_cmd,
-                                capture_output=True,
-                                text=True,
-                                timeout=2,
-                                check=False,
-                                creationflags=CREATE_NO_WINDOW,
-                            )
+                            result = _run_cli(check_cmd, timeout=2)
 
                             if result.returncode == 0:
                                 mcu_connected = True
                                 if progress_callback:
-                                    progress_callback(f"MCU detected after {poll * poll_interval:.1f} seconds!")
+                                    progress_callback(
+                                        f"MCU detected after {poll * poll_interval:.1f} seconds!"
+                                    )
                                 break
                         except subprocess.TimeoutExpired:
                             pass
 
                         # Don't spam progress messages
                         if poll % 4 == 0 and poll > 0 and progress_callback:
-                            progress_callback(f"Still waiting... ({poll * poll_interval:.0f}s/{connection_timeout}s)")
+                            progress_callback(
+                                f"Still waiting... ({poll * poll_interval:.0f}s"
+                                f"/{connection_timeout}s)"
+                            )
 
                         time.sleep(poll_interval)
 
                     if not mcu_connected and progress_callback:
-                        progress_callback("Warning: MCU not detected yet, attempting upload anyway...")
-
-                cmd = [
-                    self.stm32_programmer_cli,
-                    "-c",
-                    f"port={port}",
-                    "-c",
-                    f"mode={connection_mode}",
-                ]
-
-                # Add connection speed
-                if connection_speed != 4000:  # Only add if not default
-                    cmd.extend(["-c", f"freq={connection_speed}"])
-
-                # Add hardware reset option
-                if hardware_reset:
-                    cmd.extend(["-c", "reset=HWrst"])
-
-                # Add upload command
-                # Use -s (start/run) instead of -rst to properly release SWD connection
-                # -s makes the MCU run and releases debugger, preventing connection lock
-                cmd.extend([
-                    "-w",
-                    firmware_path,
-                    flash_address,
-                    "-v",
-                    "-s",  # Start MCU application and release debugger
-                ])
+                        progress_callback(
+                            "Warning: MCU not detected yet, attempting upload anyway..."
+                        )
+
+                    if skip_if_unchanged and self._firmware_matches(
+                        builder, firmware_path, flash_address
+                    ):
+                        if progress_callback:
+                            progress_callback("Firmware unchanged on target, skipping upload")
+                        return True
 
                 if progress_callback:
                     if attempt > 0:
-                        progress_callback(f"STM32 upload retry attempt {attempt + 1}/{retry_attempts}")
-                    progress_callback(f"Starting STM32 upload: {Path(firmware_path).name}")
-                    progress_callback(f"Port: {port}, Address: {flash_address}")
-                    progress_callback(f"Mode: {connection_mode}, Speed: {connection_speed}kHz")
-                    if hardware_reset:
-                        progress_callback("Hardware reset enabled")
+                        progress_callback(
+                            f"STM32 upload retry attempt {attempt + 1}/{retry_attempts}"
+                        )
+                    for message in start_messages:
+                        progress_callback(message)
 
                 # Try the upload
-                success = self._execute_stm32_command(cmd, progress_callback)
+                success = self._execute_stm32_command(
+                    cmd, progress_callback, idle_timeout, overall_timeout
+                )
                 if success:
                     # CRITICAL: Kill any remaining STM32_Programmer_CLI processes
                     # This is necessary because the CLI sometimes keeps background connections
-                    import time
                     if progress_callback:
                         progress_callback("Waiting for upload to complete...")
-                    time.sleep(0.5)  # Let upload finish cleanly
 
                     # Kill any lingering STM32_Programmer_CLI processes
-                    self._kill_lingering_processes(progress_callback)
+                    if self.kill_stray_processes:
+                        self._kill_lingering_processes(progress_callback)
 
-                    # Additional delay for hardware to release
-                    time.sleep(0.5)
+                    # Wait for hardware to release, but no longer than needed
+                    self._wait_for_probe_release()
 
                     # Try explicit disconnect
                     self._disconnect_programmer(port, connection_mode, progress_callback)
                     return True
+                elif self.stop_flag:
+                    # Stopped mid-upload; don't retry
+                    return False
                 elif attempt < retry_attempts - 1:
                     if progress_callback:
                         progress_callback(
@@ -297,11 +813,87 @@ class STM32Uploader:
             # All attempts failed
             return False
 
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as e:
+        except FileNotFoundError:
+            if progress_callback:
+                progress_callback(_CLI_NOT_FOUND)
+            return False
+        except (subprocess.TimeoutExpired, OSError) as e:
             if progress_callback:
                 progress_callback(f"STM32 upload error: {str(e)}")
             return False
 
+    @classmethod
+    def upload_many(
+        cls,
+        firmware_path: str,
+        ports: List[str],
+        progress_callback: Optional[Callable[[str, str], None]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, bool]:
+        """Upload the same firmware to several probes in parallel.
+
+        ``ports`` are serial port names, or ``"SWD@<sn>"`` / ``"JTAG@<sn>"`` to pick
+        one ST-Link by serial number (a bare ``"SWD"`` always means the first
+        probe, so it can appear only once). Each entry gets its own uploader;
+        at most as many run at once as the shared CLI pool has workers, so their
+        connection and release polls don't starve each other.
+        ``progress_callback`` receives ``(port, message)``; other keyword
+        arguments are passed to upload_firmware. Automatic mode is not supported.
+
+        Returns:
+            Mapping of each entry in ``ports`` to whether its upload succeeded
+
+        Raises:
+            ValueError: auto_mode was requested or ``ports`` has duplicates
+        """
+        if kwargs.get("auto_mode"):
+            raise ValueError("upload_many does not support auto_mode")
+        if len(set(ports)) != len(ports):
+            raise ValueError("upload_many needs distinct ports; use SWD@<sn> for each ST-Link")
+        if not ports:
+            return {}
+
+        def upload_one(target: str) -> bool:
+            port, _, sn = target.partition("@")
+            uploader = cls()
+            uploader.kill_stray_processes = False
+            uploader.probe_sn = sn or None
+            callback = functools.partial(progress_callback, target) if progress_callback else None
+            return bool(
+                uploader.upload_firmware(
+                    firmware_path, port=port, progress_callback=callback, **kwargs
+                )
+            )
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(ports), _CLI_POOL_SIZE), thread_name_prefix="stm32upload"
+        ) as executor:
+            return dict(zip(ports, executor.map(upload_one, ports)))
+
+    def _firmware_matches(self, builder: _CmdBuilder, firmware_path: str, address: str) -> bool:
+        """Return True if the target's flash already holds ``firmware_path``.
+
+        Reads the image's length of flash back into a temp file and compares
+        SHA-256 digests. Only raw ``.bin`` images can be compared this way; for
+        other formats, and on any failure (no target, read error), the answer
+        is "differs" so the caller falls back to a normal upload.
+        """
+        if not firmware_path.lower().endswith(".bin"):
+            return False
+        size = os.path.getsize(firmware_path)
+        if size == 0:
+            return False
+
+        with tempfile.TemporaryDirectory(prefix="stm32readback") as tmpdir:
+            readback_path = os.path.join(tmpdir, "flash.bin")
+            try:
+                result = _run_cli(builder.read_back(address, size, readback_path), timeout=60)
+            except (subprocess.TimeoutExpired, OSError):
+                return False
+            if result.returncode != 0 or not os.path.isfile(readback_path):
+                return False
+            return _sha256_file(readback_path) == _sha256_file(firmware_path)
+
     def _upload_automatic_mode(
         self,
         firmware_path: str,
@@ -311,7 +903,9 @@ class STM32Uploader:
         hardware_reset: bool,
         connection_speed: int,
         progress_callback: Optional[Callable[[str], None]] = None,
-    ) -> bool:
+        verify: bool = True,
+        skip_if_unchanged: bool = False,
+    ) -> UploadStatus:
         """Upload firmware in automatic mode.
 
         Automatic mode continuously polls for MCU connection,
@@ -325,8 +919,6 @@ class STM32Uploader:
         3. Wait for MCU to disconnect
         4. Loop back to step 1 (wait for next MCU)
         """
-        import time
-
         try:
             if progress_callback:
                 progress_callback("=" * 70)
@@ -338,7 +930,7 @@ class STM32Uploader:
                 progress_callback("To stop: Close application or press Ctrl+C in terminal")
                 progress_callback("=" * 70)
                 progress_callback(f"Configuration:")
-                progress_callback(f"  Firmware: {Path(firmware_path).name}")
+                progress_callback(f"  Firmware: {os.path.basename(firmware_path)}")
                 progress_callback(f"  Address: {flash_address}")
                 progress_callback(f"  Port: {port}, Mode: {connection_mode}")
                 progress_callback("=" * 70)
@@ -346,33 +938,22 @@ class STM32Uploader:
 
             upload_count = 0
             last_connected = False
+            check_cmd = self._builder(port, connection_mode).probe(connection_speed)
+            use_stlink_gate = _stlink_gate_applies(port, self.stm32_programmer_cli)
 
             # Continuous polling loop
             while not self.stop_flag:
                 try:
                     # Check if MCU is connected
-                    check_cmd = [
-                        self.stm32_programmer_cli,
-                        "-c",
-                        f"port={port}",
-                        "-c",
-                        f"mode={connection_mode}",
-                        "-c",
-                        f"freq={connection_speed}",
-                    ]
-
-                    # Quick connection check (1 second timeout)
-                    result = subprocess.run(
-                        check_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=1,
-                        check=False,
-                        creationflags=CREATE_NO_WINDOW,
-                    )
+                    if use_stlink_gate and _stlink_attached() is False:
+                        # No ST-Link on USB, so no MCU can be reached; skip the CLI
+                        is_connected = False
+                    else:
+                        # Quick connection check (1 second timeout)
+                        result = _run_cli(check_cmd, timeout=1)
 
-                    # Check if connected
-                    is_connected = result.returncode == 0
+                        # Check if connected
+                        is_connected = result.returncode == 0
 
                     if is_connected and not last_connected:
                         # MCU just connected! Upload immediately
@@ -394,12 +975,22 @@ class STM32Uploader:
                             connection_speed=connection_speed,
                             retry_attempts=1,
                             auto_mode=False,  # Don't recurse!
+                            verify=verify,
+                            skip_if_unchanged=skip_if_unchanged,
                         )
 
+                        if not success and self.stop_flag:
+                            # Upload was cut short by Stop: not a failed board, so
+                            # leave the counters and background alone
+                            upload_count -= 1
+                            break
+
                         if success:
                             if progress_callback:
                                 progress_callback(f"MCU #{upload_count} UPLOAD SUCCESS!")
-                                progress_callback("Ready for next board. Waiting for MCU power off...")
+                                progress_callback(
+                                    "Ready for next board. Waiting for MCU power off..."
+                                )
                                 progress_callback("")
                                 # Send special signals
                                 progress_callback("COUNTER:INCREMENT_PASS")
@@ -431,8 +1022,11 @@ class STM32Uploader:
                             # Only show on first wait
                             pass  # Already showed message
 
-                    # Wait before next poll
-                    time.sleep(1)
+                    # Wait before next poll; a probe being plugged in cuts the wait short
+                    if is_connected:
+                        time.sleep(1)
+                    else:
+                        _wait_for_stlink_arrival(1)
 
                 except subprocess.TimeoutExpired:
                     # Connection check timed out - MCU not connected
@@ -448,7 +1042,7 @@ class STM32Uploader:
                         progress_callback("")
                         progress_callback("Automatic mode stopped by user (Ctrl+C)")
                     self.stop_flag = False
-                    return 2  # Stopped by user
+                    return UploadStatus.STOPPED
 
             # Determine return status based on how automatic mode ended
             if self.stop_flag:
@@ -457,21 +1051,26 @@ class STM32Uploader:
                     progress_callback("")
                     progress_callback("Automatic mode stopped by user")
                 self.stop_flag = False
-                return 2  # Status code 2: Stopped by user
+                return UploadStatus.STOPPED
             elif upload_count > 0:
                 # At least one upload succeeded
                 self.stop_flag = False
-                return True  # Status code 1: Success
+                return UploadStatus.SUCCESS
             else:
                 # No uploads completed
                 self.stop_flag = False
-                return False  # Status code 0: Failure
+                return UploadStatus.FAILURE
 
+        except FileNotFoundError:
+            if progress_callback:
+                progress_callback(_CLI_NOT_FOUND)
+            self.stop_flag = False
+            return UploadStatus.FAILURE
         except Exception as e:
             if progress_callback:
                 progress_callback(f"Automatic mode error: {str(e)}")
             self.stop_flag = False
-            return False
+            return UploadStatus.FAILURE
 
     def _kill_lingering_processes(
         self, progress_callback: Optional[Callable[[str], None]] = None
@@ -481,16 +1080,17 @@ class STM32Uploader:
         Sometimes STM32_Programmer_CLI keeps running in background maintaining SWD lock.
         This forcefully terminates those processes to release the connection.
         """
-        try:
-            import subprocess
+        if PSUTIL is not None:
+            return self._kill_with_psutil(progress_callback)
 
+        try:
             system_type = platform.system()
 
             if system_type == "Windows":
                 # Windows: Use taskkill
                 cmd = ["taskkill", "/F", "/IM", "STM32_Programmer_CLI.exe", "/T"]
                 result = subprocess.run(
-                    cmd, capture_output=True, text=True, timeout=3, check=False, creationflags=CREATE_NO_WINDOW
+                    cmd, capture_output=True, text=True, timeout=3, check=False, **_SUBPROCESS_KW
                 )
 
                 if "SUCCESS" in result.stdout or "not found" in result.stderr.lower():
@@ -500,7 +1100,9 @@ class STM32Uploader:
             else:
                 # Linux/Mac: Use pkill
                 cmd = ["pkill", "-9", "STM32_Programmer"]
-                subprocess.run(cmd, capture_output=True, text=True, timeout=3, check=False, creationflags=CREATE_NO_WINDOW)
+                subprocess.run(
+                    cmd, capture_output=True, text=True, timeout=3, check=False, **_SUBPROCESS_KW
+                )
 
                 if progress_callback:
                     progress_callback("Terminated lingering programmer processes")
@@ -510,6 +1112,54 @@ class STM32Uploader:
             # Process killing failures are non-critical
             return False
 
+    @staticmethod
+    def _kill_with_psutil(progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+        """Kill stray STM32_Programmer_CLI processes without spawning taskkill/pkill.
+
+        Returns once the killed processes have exited (at most 1 s), so the
+        probe is no longer held when the caller checks it.
+        """
+        killed = []
+        for proc in PSUTIL.process_iter(["name"]):
+            name = proc.info["name"] or ""
+            if not name.lower().startswith("stm32_programmer"):
+                continue
+            try:
+                proc.kill()
+                killed.append(proc)
+            except (PSUTIL.NoSuchProcess, PSUTIL.AccessDenied):
+                # Already gone, or owned by another user
+                pass
+
+        if killed:
+            PSUTIL.wait_procs(killed, timeout=1)
+            if progress_callback:
+                progress_callback("Terminated lingering programmer processes")
+        return True
+
+    def _wait_for_probe_release(self, max_wait: float = 1.0) -> bool:
+        """Wait until the ST-Link can be enumerated again, at most ``max_wait`` seconds.
+
+        Returns:
+            True if the probe answered before the deadline
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                result = _run_cli([self.stm32_programmer_cli, "-l"], timeout=remaining)
+                if result.returncode == 0:
+                    return True
+            except subprocess.TimeoutExpired:
+                return False
+            except OSError:
+                # Can't probe; fall back to waiting out the full delay
+                time.sleep(max(deadline - time.monotonic(), 0))
+                return False
+            time.sleep(0.05)
+
     def _disconnect_programmer(
         self,
         port: str,
@@ -525,126 +1175,204 @@ class STM32Uploader:
             if progress_callback:
                 progress_callback("Releasing ST-Link connection...")
 
-            # Method 1: Hard reset of ST-Link interface itself
-            # This is more aggressive and resets the programmer hardware
-            reset_cmd = [
-                self.stm32_programmer_cli,
-                "-c",
-                f"port={port}",
-                "-c",
-                f"mode={connection_mode}",
-                "-c",
-                "reset=HWrst",  # Hardware reset - more thorough
-            ]
-
-            result = subprocess.run(
-                reset_cmd, capture_output=True, text=True, timeout=5, check=False, creationflags=CREATE_NO_WINDOW
-            )
-
-            # Wait for hardware to settle
-            import time
-            time.sleep(0.5)
-
-            # Method 2: Now explicitly disconnect by running without commands
-            # Just connect and immediately exit - forces clean disconnect
-            disconnect_cmd = [
-                self.stm32_programmer_cli,
-                "-c",
-                f"port={port}",
-                "-c",
-                f"mode={connection_mode}",
-            ]
-
-            # Run with very short timeout to force quick exit
-            try:
-                subprocess.run(disconnect_cmd, capture_output=True, text=True, timeout=1, check=False, creationflags=CREATE_NO_WINDOW)
-            except subprocess.TimeoutExpired:
-                pass  # Timeout is expected and desired
+            # Hardware reset through the probe. The CLI drops the SWD connection
+            # when it exits, so this one launch both resets and releases the target.
+            reset_cmd = self._builder(port, connection_mode).hardware_reset()
+            _run_cli(reset_cmd, timeout=5)
 
             if progress_callback:
                 progress_callback("ST-Link connection released")
 
-            # Final wait to ensure ST-Link firmware has released the connection
-            time.sleep(0.3)
+            # Wait for the target and ST-Link firmware to settle
+            time.sleep(0.5)
 
             return True
 
-        except (FileNotFoundError, OSError) as e:
+        except (subprocess.TimeoutExpired, OSError) as e:
             # Disconnect errors are not critical
             if progress_callback:
                 progress_callback(f"Note: Disconnect command issue: {str(e)}")
             return False
 
-    def _execute_stm32_command(self, cmd, progress_callback):
-        """Execute STM32 command and handle output."""
+    @staticmethod
+    def _run_coroutine(coro):
+        """Run ``coro`` to completion from synchronous code."""
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                encoding="utf-8",
-                errors="ignore",  # Ignore encoding errors
-                creationflags=CREATE_NO_WINDOW,
-            )
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
 
-            while True:
-                if process.stdout is None:
-                    break
-                output = process.stdout.readline()
-                if output == "" and process.poll() is not None:
-                    break
-                if output and progress_callback:
-                    output = output.strip()
-                    if output and not output.startswith("Note:"):
-                        # Filter out progress bar characters and non-ASCII content
-                        if any(char in output for char in ["█", "▓", "▒", "░"]) or "%" in output:
-                            # Extract percentage if available
-                            try:
-                                if "%" in output:
-                                    percent_pos = output.find("%")
-                                    if percent_pos > 0:
-                                        # Find the percentage number before %
-                                        start = percent_pos - 1
-                                        while start >= 0 and (
-                                            output[start].isdigit() or output[start] == "."
-                                        ):
-                                            start -= 1
-                                        if start < percent_pos - 1:
-                                            percent = output[start + 1 : percent_pos]
-                                            progress_callback(f"Programming... {percent}%")
-                            except:
-                                progress_callback("Programming...")
-                        elif "Memory Programming" in output:
-                            progress_callback("Programming flash memory...")
-                        elif "Download verified successfully" in output:
-                            progress_callback("Verification complete")
-                        elif "RUNNING" in output:
-                            progress_callback("Firmware uploaded successfully")
-                        elif "Download in Progress" in output:
-                            progress_callback("Starting download...")
-                        elif len(output) > 0 and all(ord(c) < 128 for c in output):
-                            # Only display ASCII-only output
-                            progress_callback(output)
-
-            return_code = process.wait()
+        # Called from inside an event loop: run on a helper thread instead
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
 
-            if return_code == 0:
-                if progress_callback:
-                    progress_callback("STM32 firmware upload completed successfully!")
-                return True
-            else:
-                if progress_callback:
-                    progress_callback(f"STM32 upload failed with return code: {return_code}")
-                return False
+    def _execute_stm32_command(
+        self,
+        cmd,
+        progress_callback,
+        idle_timeout: Optional[float] = None,
+        overall_timeout: Optional[float] = None,
+    ):
+        """Execute STM32 command and handle output."""
+        return self._run_coroutine(
+            self._execute_stm32_command_async(cmd, progress_callback, idle_timeout, overall_timeout)
+        )
 
+    async def _execute_stm32_command_async(
+        self,
+        cmd,
+        progress_callback,
+        idle_timeout: Optional[float] = None,
+        overall_timeout: Optional[float] = None,
+    ):
+        """Execute STM32 command, reporting output lines as they arrive.
+
+        Cancelling the task terminates STM32_Programmer_CLI.
+        """
+        try:
+            return_code = await self._stream_command(
+                cmd,
+                progress_callback,
+                idle_timeout=idle_timeout,
+                idle_message="Still programming...",
+                overall_timeout=overall_timeout,
+            )
         except (subprocess.TimeoutExpired, FileNotFoundError, OSError) as e:
             if progress_callback:
                 progress_callback(f"STM32 command error: {str(e)}")
             return False
 
+        if return_code is None:
+            if progress_callback:
+                if self.stop_flag:
+                    progress_callback("STM32 upload stopped by user")
+                else:
+                    progress_callback("STM32 upload aborted: programmer stopped responding")
+            return False
+        if return_code == 0:
+            if progress_callback:
+                progress_callback("STM32 firmware upload completed successfully!")
+            return True
+        else:
+            if progress_callback:
+                progress_callback(f"STM32 upload failed with return code: {return_code}")
+            return False
+
+    async def _stream_command(
+        self,
+        cmd,
+        progress_callback,
+        idle_timeout: Optional[float] = None,
+        idle_message: str = "Still working...",
+        overall_timeout: Optional[float] = None,
+    ) -> Optional[int]:
+        """Run ``cmd``, reporting its output lines, and return its exit code.
+
+        With ``idle_timeout`` the deadline is progress-based: the CLI is
+        killed only after that many seconds without output, and
+        ``idle_message`` is reported every couple of seconds while it is quiet.
+        ``overall_timeout`` is a hard cap on the total run time. Setting
+        ``stop_flag`` kills the CLI within ``_STOP_POLL_INTERVAL`` seconds.
+
+        Returns:
+            Exit code, or None if the CLI was killed by a timeout or a stop request
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            **_SUBPROCESS_KW,
+        )
+
+        try:
+            coalescer = _ProgressCoalescer(progress_callback) if progress_callback else None
+            # Ignore encoding errors; split on \r too so progress bars
+            # redrawn in place arrive as separate lines
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+            pending = ""
+            last_output = last_notice = time.monotonic()
+            deadline = None if overall_timeout is None else last_output + overall_timeout
+            while process.stdout is not None:
+                now = time.monotonic()
+                if (
+                    self.stop_flag
+                    or (idle_timeout is not None and now - last_output >= idle_timeout)
+                    or (deadline is not None and now >= deadline)
+                ):
+                    process.kill()
+                    await process.wait()
+                    return None
+
+                # Always bounded, so a stop request is seen even while the CLI is quiet
+                wait = _STOP_POLL_INTERVAL
+                if coalescer and coalescer.has_pending:
+                    # Don't let a held-back percentage go stale if the CLI stalls
+                    wait = min(wait, coalescer.interval)
+                # Wake up exactly when a timeout is due
+                if idle_timeout is not None:
+                    wait = min(wait, last_output + idle_timeout - now)
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                try:
+                    chunk = await asyncio.wait_for(process.stdout.read(_READ_CHUNK_SIZE), wait)
+                except asyncio.TimeoutError:
+                    if coalescer:
+                        coalescer.flush()
+                    now = time.monotonic()
+                    if (
+                        idle_timeout is not None
+                        and progress_callback
+                        and now - last_notice >= _IDLE_NOTICE_INTERVAL
+                    ):
+                        last_notice = now
+                        progress_callback(f"{idle_message} ({now - last_output:.0f}s)")
+                    continue
+
+                last_output = last_notice = time.monotonic()
+                pending += decoder.decode(chunk, final=not chunk)
+                *lines, pending = _LINE_SPLIT_RE.split(pending)
+                if coalescer:
+                    for output in lines:
+                        self._report_output_line(output, coalescer.offer)
+                if not chunk:
+                    break
+            if coalescer:
+                if pending:
+                    self._report_output_line(pending, coalescer.offer)
+                coalescer.flush()
+
+            return await process.wait()
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.terminate()
+                await process.wait()
+            raise
+
+    def _report_output_line(self, output, report):
+        """Translate one line of STM32_Programmer_CLI output into a progress message.
+
+        ``report`` is a :meth:`_ProgressCoalescer.offer`; percent updates are
+        marked as coalescable.
+        """
+        output = output.strip()
+        if not output or output.startswith("Note:"):
+            return
+
+        # Filter out progress bar characters and non-ASCII content
+        if not _PROGRESS_BAR_CHARS.isdisjoint(output):
+            # Extract percentage if available
+            match = _PERCENT_RE.search(output)
+            if match:
+                report(f"Programming... {match.group(1)}%", coalesce=True)
+            return
+
+        match = _STATUS_RE.search(output)
+        if match:
+            report(_STATUS_MESSAGES[match.group()])
+        elif output.isascii():
+            # Only display ASCII-only output
+            report(output)
+
     def erase_flash(
         self,
         port: str = "SWD",
@@ -663,12 +1391,7 @@ class STM32Uploader:
         Note: STM32 ignores ESP32-specific parameters (chip, baud_rate, etc.)
         but accepts them for interface compatibility.
         """
-        if not self.is_stm32_programmer_cli_available():
-            return False
-
         try:
-            import time
-
             # Pre-connection check - wait for MCU to be ready
             # Same logic as upload_firmware to ensure MCU is connected
             # Works for all modes: HOTPLUG, UR (Under Reset), Normal
@@ -682,72 +1405,71 @@ class STM32Uploader:
             poll_interval = 0.5  # seconds
             max_polls = int(connection_timeout / poll_interval)
 
+            builder = self._builder(port, connection_mode)
+            check_cmd = builder.probe(connection_speed)
+
             mcu_connected = False
             for poll in range(max_polls):
                 # Quick connection check
-                check_cmd = [
-                    self.stm32_programmer_cli,
-                    "-c",
-                    f"port={port}",
-                    "-c",
-                    f"mode={connection_mode}",
-                    "-c",
-                    f"freq={connection_speed}",
-                ]
-
                 try:
-                    result = subprocess.run(
-                        check_cmd,
-                        capture_output=True,
-                        text=True,
-                        timeout=2,
-                        check=False,
-                        creationflags=CREATE_NO_WINDOW,
-                    )
+                    result = _run_cli(check_cmd, timeout=2)
 
                     if result.returncode == 0:
                         mcu_connected = True
                         if progress_callback:
-                            progress_callback(f"MCU detected after {poll * poll_interval:.1f} seconds!")
+                            progress_callback(
+                                f"MCU detected after {poll * poll_interval:.1f} seconds!"
+                            )
                         break
                 except subprocess.TimeoutExpired:
                     pass
 
                 # Don't spam progress messages
                 if poll % 4 == 0 and poll > 0 and progress_callback:
-                    progress_callback(f"Still waiting... ({poll * poll_interval:.0f}s/{connection_timeout}s)")
+                    progress_callback(
+                        f"Still waiting... ({poll * poll_interval:.0f}s/{connection_timeout}s)"
+                    )
 
                 time.sleep(poll_interval)
 
             if not mcu_connected and progress_callback:
                 progress_callback("Warning: MCU not detected yet, attempting erase anyway...")
 
-            cmd = [
-                self.stm32_programmer_cli,
-                "-c",
-                f"port={port}",
-                "-c",
-                f"mode={connection_mode}",
-                "-e",
-                "all",
-            ]
+            cmd = builder.erase()
 
             if progress_callback:
                 progress_callback(f"Erasing STM32 flash on port {port}...")
                 if baud_rate != 921600:
                     progress_callback(f"Note: STM32 ignores baud rate setting ({baud_rate})")
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, check=False, creationflags=CREATE_NO_WINDOW)
+            # Large flashes can take longer than any fixed limit, so only give
+            # up once the CLI has been silent for 30 seconds
+            return_code = self._run_coroutine(
+                self._stream_command(
+                    cmd, progress_callback, idle_timeout=30, idle_message="Still erasing..."
+                )
+            )
 
-            if result.returncode == 0:
+            if return_code == 0:
                 if progress_callback:
                     progress_callback("STM32 flash erased successfully!")
                 return True
+            elif return_code is None:
+                if progress_callback:
+                    if self.stop_flag:
+                        progress_callback("STM32 erase stopped by user")
+                    else:
+                        progress_callback("STM32 erase failed: no response from programmer for 30s")
+                return False
             else:
                 if progress_callback:
-                    progress_callback(f"STM32 erase failed: {result.stderr}")
+                    progress_callback(f"STM32 erase failed with return code: {return_code}")
                 return False
-        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        except FileNotFoundError:
+            if progress_callback:
+                progress_callback(_CLI_NOT_FOUND)
+            return False
+        except (subprocess.TimeoutExpired, OSError) as e:
             if progress_callback:
                 progress_callback(f"STM32 erase error: {str(e)}")
             return False
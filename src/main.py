@@ -1,21 +1,24 @@
 #!/usr/bin/env python3
 """WF firmware uploader main application."""
 
+import functools
 import os
 import platform
 import sys
 
-from PySide6.QtWidgets import QApplication
-
-from core.settings import SettingsManager
-from ui.main_window import MainWindow
-
 
+@functools.lru_cache(maxsize=1)
 def detect_platform():
-    """Detect if running on WSL, Windows, or Linux."""
+    """Detect if running on WSL, Windows, or Linux.
+
+    Cached: the answer can't change while the process runs.
+    """
     system = platform.system()
 
     if system == "Linux":
+        # WSL sets these for every process it starts; /proc/version is the fallback
+        if "WSL_DISTRO_NAME" in os.environ or "WSL_INTEROP" in os.environ:
+            return "WSL"
         # Check if running on WSL
         try:
             with open("/proc/version", "r", encoding="utf-8") as f:
@@ -30,19 +33,22 @@ def detect_platform():
         return system
 
 
-def setup_ui_scaling(settings_manager):
-    """Setup UI scaling based on platform and settings."""
+def setup_ui_scaling(settings_manager, platform_type=None):
+    """Setup UI scaling based on platform and settings.
+
+    ``platform_type`` is the result of detect_platform(), detected here if omitted.
+    """
     # Get scaling settings
-    ui_settings = settings_manager.settings.get("ui", {})
-    auto_platform_scale = ui_settings.get("auto_platform_scale", True)
-    custom_scale_factor = ui_settings.get("scale_factor", None)
+    ui_settings = settings_manager.settings.get("ui") or {}
+    custom_scale_factor = ui_settings.get("scale_factor")
 
     if custom_scale_factor is not None:
         # Use custom scale factor
         scale_factor = custom_scale_factor
-    elif auto_platform_scale:
+    elif ui_settings.get("auto_platform_scale", True):
         # Auto platform scaling
-        platform_type = detect_platform()
+        if platform_type is None:
+            platform_type = detect_platform()
         if platform_type == "WSL":
             scale_factor = 1.3  # 30% larger for WSL
         elif platform_type == "Windows":
@@ -63,11 +69,18 @@ def setup_ui_scaling(settings_manager):
 
 def main():
     """Run the main application."""
+    # Imported here so "exe -m esptool" subprocesses never load Qt or the UI
+    from PySide6.QtWidgets import QApplication
+
+    from core.settings import SettingsManager
+    from ui.main_window import MainWindow
+
     # Initialize settings manager
     settings_manager = SettingsManager()
+    platform_type = detect_platform()
 
     # Setup UI scaling before creating QApplication
-    scale_factor = setup_ui_scaling(settings_manager)
+    scale_factor = setup_ui_scaling(settings_manager, platform_type)
 
     app = QApplication(sys.argv)
     app.setApplicationName("WF Firmware Uploader")
@@ -77,10 +90,9 @@ def main():
     # High DPI support is enabled by default in Qt6/PySide6
 
     # Print scaling info for debugging
-    platform_type = detect_platform()
     print(f"Platform: {platform_type}, Scale Factor: {scale_factor}")
 
-    window = MainWindow()
+    window = MainWindow(settings_manager)
     window.showMaximized()  # Start maximized
 
     return app.exec()
@@ -2,7 +2,7 @@
 
 from typing import Any, Optional, Union
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
     QMainWindow,
     QMessageBox,
@@ -21,16 +21,26 @@ from ui.workers import UploadWorkerThread
 class MainWindow(QMainWindow):
     """Main window class."""
 
-    def __init__(self):
-        """Initialize main window."""
+    def __init__(self, settings_manager: Optional[SettingsManager] = None):
+        """Initialize main window.
+
+        Args:
+            settings_manager: Already-loaded settings to reuse; loaded here if omitted
+        """
         super().__init__()
-        self.settings_manager = SettingsManager()
+        self.settings_manager = settings_manager or SettingsManager()
         self.stm32_uploader = STM32Uploader()
         self.esp32_uploader = ESP32Uploader()
         self.upload_threads = {}
         self.init_ui()
         self.load_settings()
 
+        # Periodically flush settings changed since the last save (e.g. counter
+        # updates from automatic mode) so bursts collapse into a single write
+        self.settings_flush_timer = QTimer(self)
+        self.settings_flush_timer.timeout.connect(self.settings_manager.maybe_flush)
+        self.settings_flush_timer.start(1000)
+
     def init_ui(self):
         """Initialize UI."""
         self.setWindowTitle("WF Firmware Uploader")
@@ -299,7 +309,7 @@ class MainWindow(QMainWindow):
         self.esp32_tab.save_settings()
 
         # Save to file
-        self.settings_manager.save_settings()
+        self.settings_manager.maybe_save()
 
     def append_log(self, message: str, device_type: str = ""):
         """Add message to appropriate device log."""
@@ -379,21 +389,21 @@ class MainWindow(QMainWindow):
                 if device_type == "STM32" and self.stm32_tab.counter_widget:
                     self.stm32_tab.counter_widget.increment_pass()
                     self.settings_manager.increment_counter_pass(device_type)
-                    self.settings_manager.save_settings()
+                    self.settings_manager.maybe_flush()
                 elif device_type == "ESP32" and self.esp32_tab.counter_widget:
                     self.esp32_tab.counter_widget.increment_pass()
                     self.settings_manager.increment_counter_pass(device_type)
-                    self.settings_manager.save_settings()
+                    self.settings_manager.maybe_flush()
                 return  # Don't add this to log
             elif message == "COUNTER:INCREMENT_FAIL":
                 if device_type == "STM32" and self.stm32_tab.counter_widget:
                     self.stm32_tab.counter_widget.increment_fail()
                     self.settings_manager.increment_counter_fail(device_type)
-                    self.settings_manager.save_settings()
+                    self.settings_manager.maybe_flush()
                 elif device_type == "ESP32" and self.esp32_tab.counter_widget:
                     self.esp32_tab.counter_widget.increment_fail()
                     self.settings_manager.increment_counter_fail(device_type)
-                    self.settings_manager.save_settings()
+                    self.settings_manager.maybe_flush()
                 return  # Don't add this to log
 
         # Handle special background color messages (for automatic mode)
@@ -475,12 +485,12 @@ class MainWindow(QMainWindow):
                 self.stm32_tab.counter_widget.increment_pass()
                 # Save counter to settings
                 self.settings_manager.increment_counter_pass(device_type)
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_flush()
             elif device_type == "ESP32" and self.esp32_tab.counter_widget:
                 self.esp32_tab.counter_widget.increment_pass()
                 # Save counter to settings
                 self.settings_manager.increment_counter_pass(device_type)
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_flush()
 
             # If ESP32 addresses were auto-fixed, update GUI and save
             if device_type == "ESP32" and was_fixed and corrected_files:
@@ -498,7 +508,7 @@ class MainWindow(QMainWindow):
                 self.stm32_tab.save_settings()
             elif device_type == "ESP32":
                 self.esp32_tab.save_settings()
-            self.settings_manager.save_settings()
+            self.settings_manager.maybe_save()
         else:
             self.append_log("Upload failed!", device_type)
 
@@ -507,12 +517,12 @@ class MainWindow(QMainWindow):
                 self.stm32_tab.counter_widget.increment_fail()
                 # Save counter to settings
                 self.settings_manager.increment_counter_fail(device_type)
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_flush()
             elif device_type == "ESP32" and self.esp32_tab.counter_widget:
                 self.esp32_tab.counter_widget.increment_fail()
                 # Save counter to settings
                 self.settings_manager.increment_counter_fail(device_type)
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_flush()
 
             # Set FAIL background color (dark red)
             if device_type == "STM32":
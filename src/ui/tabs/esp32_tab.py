@@ -3,7 +3,7 @@
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QTextCursor
 from PySide6.QtWidgets import (
     QCheckBox,
@@ -22,7 +22,7 @@ from PySide6.QtWidgets import (
     QTextEdit,
 )
 
-from core.serial_utils import SerialPortManager
+from core.serial_utils import format_port_display, get_available_ports
 from core.settings import SettingsManager
 from ui.widgets.counter_widget import CounterWidget
 
@@ -397,8 +397,8 @@ class ESP32Tab(QWidget):
 
         layout.addWidget(self.log_group, stretch=1)
 
-        # Initialize ports
-        self.refresh_ports()
+        # Enumerate ports once the window is up; the scan is the slow part of startup
+        QTimer.singleShot(0, self.refresh_ports)
 
     def add_firmware_file(self):
         """Add a firmware file with address."""
@@ -434,7 +434,7 @@ class ESP32Tab(QWidget):
                     # Auto-save settings when file is added
                     self.save_settings()
                     if self.settings_manager:
-                        self.settings_manager.save_settings()
+                        self.settings_manager.maybe_save()
                 except ValueError:
                     msg = QMessageBox(self)
                     msg.setIcon(QMessageBox.Icon.Warning)
@@ -476,7 +476,7 @@ class ESP32Tab(QWidget):
             # Auto-save settings
             self.save_settings()
             if self.settings_manager:
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_save()
 
     def setup_full_build(self):
         """Quick setup for full ESP32 build directory with automatic chip detection."""
@@ -533,7 +533,7 @@ class ESP32Tab(QWidget):
             # Auto-save settings
             self.save_settings()
             if self.settings_manager:
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_save()
 
     def edit_firmware_file(self, item):
         """Edit the flash address of a firmware file."""
@@ -567,7 +567,7 @@ class ESP32Tab(QWidget):
                     # Auto-save settings
                     self.save_settings()
                     if self.settings_manager:
-                        self.settings_manager.save_settings()
+                        self.settings_manager.maybe_save()
                 except ValueError:
                     msg = QMessageBox(self)
                     msg.setIcon(QMessageBox.Icon.Warning)
@@ -585,7 +585,7 @@ class ESP32Tab(QWidget):
             # Auto-save settings
             self.save_settings()
             if self.settings_manager:
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_save()
 
     def clear_firmware_files(self):
         """Clear all firmware files."""
@@ -594,7 +594,7 @@ class ESP32Tab(QWidget):
         # Auto-save settings
         self.save_settings()
         if self.settings_manager:
-            self.settings_manager.save_settings()
+            self.settings_manager.maybe_save()
 
     def update_file_list(self):
         """Update the file list display."""
@@ -607,12 +607,15 @@ class ESP32Tab(QWidget):
 
     def refresh_ports(self):
         """Refresh serial port list."""
-        current_port = self.port_combo.currentText()
+        # Before the first scan the list is empty; fall back to the saved port
+        current_port = self.port_combo.currentData()
+        if current_port is None and self.settings_manager:
+            current_port = self.settings_manager.get_esp32_last_port()
         self.port_combo.clear()
 
-        ports = SerialPortManager.get_available_ports()
+        ports = get_available_ports()
         for port in ports:
-            display_text = SerialPortManager.format_port_display(port)
+            display_text = format_port_display(port)
             self.port_combo.addItem(display_text, port["device"])
 
         if current_port:
@@ -738,7 +741,7 @@ class ESP32Tab(QWidget):
         """Handle settings change - auto-save settings."""
         self.save_settings()
         if self.settings_manager:
-            self.settings_manager.save_settings()
+            self.settings_manager.maybe_save()
 
     def on_no_sync_changed(self, checked: bool):
         """Handle no-sync checkbox change."""
@@ -829,7 +832,7 @@ class ESP32Tab(QWidget):
         # Save reset counters to settings
         if self.settings_manager:
             self.settings_manager.reset_counters(self.device_type)
-            self.settings_manager.save_settings()
+            self.settings_manager.maybe_save()
         self.append_log(f"{self.device_type} counters reset")
 
     def set_upload_button_uploading(self):
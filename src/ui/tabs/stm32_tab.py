@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QTextCursor
 from PySide6.QtWidgets import (
     QButtonGroup,
@@ -21,7 +21,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from core.serial_utils import SerialPortManager
+from core.serial_utils import format_port_display, get_available_ports
 from core.settings import SettingsManager
 from ui.widgets.counter_widget import CounterWidget
 
@@ -268,8 +268,8 @@ class STM32Tab(QWidget):
 
         layout.addWidget(self.log_group, stretch=1)
 
-        # Initialize ports
-        self.refresh_ports()
+        # Enumerate ports once the window is up; the scan is the slow part of startup
+        QTimer.singleShot(0, self.refresh_ports)
 
     def browse_file(self):
         """Select firmware file."""
@@ -284,20 +284,23 @@ class STM32Tab(QWidget):
             # Auto-save settings when file is selected
             self.save_settings()
             if self.settings_manager:
-                self.settings_manager.save_settings()
+                self.settings_manager.maybe_save()
 
     def refresh_ports(self):
         """Refresh serial port list."""
-        current_port = self.port_combo.currentText()
+        # Before the first scan the list is empty; fall back to the saved port
+        current_port = self.port_combo.currentData()
+        if current_port is None and self.settings_manager:
+            current_port = self.settings_manager.get_stm32_last_port()
         self.port_combo.clear()
 
         # Add SWD option for STM32
         if self.device_type == "STM32":
             self.port_combo.addItem("SWD", "SWD")
 
-        ports = SerialPortManager.get_available_ports()
+        ports = get_available_ports()
         for port in ports:
-            display_text = SerialPortManager.format_port_display(port)
+            display_text = format_port_display(port)
             self.port_combo.addItem(display_text, port["device"])
 
         # Set default selection
@@ -621,7 +624,7 @@ class STM32Tab(QWidget):
         # Save reset counters to settings
         if self.settings_manager:
             self.settings_manager.reset_counters(self.device_type)
-            self.settings_manager.save_settings()
+            self.settings_manager.maybe_save()
         self.append_log(f"{self.device_type} counters reset")
 
     def set_upload_button_uploading(self):